@@ -0,0 +1,234 @@
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+import numpy as np
+import cv2
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.interactive.display import DisplayEngine, load_map_image, PROFILE_STAGES, DISPLAY_FPS
+from core.interactive.hand_tracking import HandResult, INDEX_FINGER_TIP, THUMB_TIP
+from core.interactive.profiler import FrameProfiler
+from core.interactive.projection import MapProjection
+from core.interactive.ship_feed import ShipSnapshot
+
+SCREEN_SIZE = (1920, 1080)
+FRAME_SIZE = (640, 480)
+CAMERA_FPS = 30
+DWELL = 3.0  # seconds the synthetic finger rests on each ship, longer than the selection dwell
+COORDINATES = {
+    "camera": {"tl_corner": [120, 80], "br_corner": [520, 400]},
+    "projector": {"tl_corner": [60, 40], "br_corner": [1860, 1040]},
+}
+
+
+# ------- Synthetic Sources -------
+class SyntheticCamera:
+    """Stands in for LatestFrameCapture: a recorded clip or generated frames, delivered at CAMERA_FPS."""
+
+    def __init__(self, clip=None, fps=CAMERA_FPS):
+        self.fps = fps
+        self.frames = load_clip(clip) if clip else noise_frames()
+        self.start = time.time()
+
+    def latest(self):
+        index = int((time.time() - self.start) * self.fps)
+        return index + 1, self.start + index / self.fps, self.frames[index % len(self.frames)]
+
+    def isOpened(self):
+        return True
+
+    def record_latency(self, captured_at):
+        pass
+
+    def release(self):
+        pass
+
+
+class SyntheticFeed:
+    """Stands in for ShipFeed: one in-memory fleet, re-issued every interval seconds."""
+
+    def __init__(self, snapshot, interval=60.0):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.next_refresh = 0.0
+
+    def take(self):
+        now = time.time()
+        if now < self.next_refresh:
+            return None
+        self.next_refresh = now + self.interval
+        return self.snapshot._replace(fix_time=[now] * len(self.snapshot.mmsi), fetched_at=now)
+
+    def is_stale(self, now=None):
+        return False
+
+    def status_text(self):
+        return ""
+
+    def stop(self):
+        pass
+
+
+class SyntheticHands:
+    """Stands in for HandTracker: one hand whose index tip visits the given camera points in turn."""
+
+    def __init__(self, frame_shape, roi=None, inference_width=None, waypoints=()):
+        self.height, self.width = frame_shape[:2]
+        self.waypoints = list(waypoints) or [(0.5, 0.5)]
+        self.pending = None
+        self.seq = 0
+        self.start = time.time()
+
+    def busy(self):
+        return False
+
+    def submit(self, frame, captured_at):
+        self.seq += 1
+        self.pending = (self.seq, captured_at)
+        return True
+
+    def poll(self):
+        if self.pending is None:
+            return None
+        seq, captured_at = self.pending
+        self.pending = None
+        x, y = self.waypoints[int((captured_at - self.start) / DWELL) % len(self.waypoints)]
+        hand = np.tile(np.array([x, y, 0.0], dtype=np.float32), (21, 1))
+        hand[THUMB_TIP, 0] += 0.15  # far enough from the index tip not to pinch
+        hand[INDEX_FINGER_TIP] = (x, y, 0.0)
+        return HandResult(seq, captured_at, time.time(), hand[np.newaxis], time.process_time())
+
+    def close(self):
+        pass
+
+
+def noise_frames(count=8):
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 255, (FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+        frames.append(cv2.GaussianBlur(frame, (9, 9), 3))
+    return frames
+
+
+def load_clip(path, max_frames=300):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"No frames in {path}")
+    return frames
+
+
+def synthetic_fleet(n, transform, src_width, src_height, rng):
+    lon0, lat0 = transform * (0, 0)
+    lon1, lat1 = transform * (src_width, src_height)
+    moored = rng.random(n) < 0.3
+    return ShipSnapshot(
+        mmsi=(np.arange(n) + 200_000_000).tolist(),
+        lat=rng.uniform(min(lat0, lat1), max(lat0, lat1), n).tolist(),
+        lon=rng.uniform(min(lon0, lon1), max(lon0, lon1), n).tolist(),
+        speed=np.where(moored, 0.0, rng.uniform(2, 25, n)).tolist(),
+        course=rng.uniform(0, 360, n).tolist(),
+        fix_time=[time.time()] * n,
+        info=[(None, f"SHIP {i}", "PIRAEUS", "", "Moored" if m else "Under way") for i, m in enumerate(moored.tolist())],
+        fetched_at=time.time(),
+        duration=0.0,
+    )
+
+
+def camera_waypoints(snapshot, projection, map_size, count, rng):
+    """Normalized camera positions of the index tip that point at a few of the ships."""
+    tl, br = COORDINATES["camera"]["tl_corner"], COORDINATES["camera"]["br_corner"]
+    xs, ys = projection.geo_to_pixel(np.array(snapshot.lat), np.array(snapshot.lon))
+    waypoints = []
+    for i in rng.choice(len(xs), size=min(count, len(xs)), replace=False).tolist():
+        norm_x = 1.0 - (xs[i] + 0.5) / map_size[0]
+        norm_y = (ys[i] + 0.5) / map_size[1]
+        waypoints.append(((tl[0] + norm_x * (br[0] - tl[0])) / FRAME_SIZE[0],
+                          (tl[1] + norm_y * (br[1] - tl[1])) / FRAME_SIZE[1]))
+    return waypoints
+
+
+# ------- Benchmark -------
+def run_config(ships, frames, clip, fps):
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    rng = np.random.default_rng(ships)
+
+    tl, br = COORDINATES["projector"]["tl_corner"], COORDINATES["projector"]["br_corner"]
+    map_size = (br[0] - tl[0], br[1] - tl[1])
+    map_image = load_map_image(map_size)
+    _, transform, src_width, src_height = map_image
+    projection = MapProjection(transform, src_width, src_height, *map_size)
+
+    snapshot = synthetic_fleet(ships, transform, src_width, src_height, rng)
+    waypoints = camera_waypoints(snapshot, projection, map_size, 8, rng)
+
+    def tracker_factory(frame_shape, roi=None, inference_width=None):
+        return SyntheticHands(frame_shape, roi, inference_width, waypoints)
+
+    profiler = FrameProfiler(PROFILE_STAGES, enabled=True, window=frames)
+    engine = DisplayEngine(screen, COORDINATES, map_image, SyntheticCamera(clip), SyntheticFeed(snapshot),
+                           tracker_factory=tracker_factory, preview=False, fps=fps, profiler=profiler)
+    engine.start()
+    start = time.perf_counter()
+    rendered = engine.run(max_frames=frames)
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+    pygame.quit()
+
+    # Time each frame spent working, i.e. without waiting for the frame cap
+    busy = np.array(profiler.samples["frame"]) - np.array(profiler.samples["idle"])
+    stages = {"busy": (np.percentile(busy, 50) * 1000, np.percentile(busy, 95) * 1000)}
+    for name in ["frame"] + PROFILE_STAGES:
+        values = profiler.percentiles(name)
+        if values is not None:
+            stages[name] = (values[0] * 1000, values[1] * 1000)
+    peak_mb = None
+    if resource is not None:
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kilobytes on Linux
+    return rendered / elapsed, stages, peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless display pipeline benchmark with synthetic camera, hands and fleet.")
+    parser.add_argument("--ships", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--clip", help="recorded webcam clip to use instead of generated frames")
+    parser.add_argument("--fps", type=int, default=DISPLAY_FPS, help="frame cap (0 = uncapped)")
+    args = parser.parse_args()
+
+    # Every configuration runs in a fresh process so peak memory is not carried over
+    context = multiprocessing.get_context("spawn")
+    for ships in args.ships:
+        with context.Pool(1) as pool:
+            fps, stages, peak_mb = pool.apply(run_config, (ships, args.frames, args.clip, args.fps))
+        memory = f"{peak_mb:.0f} MB peak RSS" if peak_mb is not None else "peak RSS n/a"
+        print(f"\n{ships} ships: {fps:.1f} FPS over {args.frames} frames, {memory}")
+        print(f"  {'stage':<14}{'p50 ms':>9}{'p95 ms':>9}")
+        for name, (p50, p95) in stages.items():
+            print(f"  {name:<14}{p50:>9.2f}{p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
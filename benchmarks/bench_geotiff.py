@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.transform import from_bounds
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.georeference.geotiff import write_geotiff, copy_geotiff
+
+IMAGE_PATH = os.path.join(PROJECT_ROOT, "data", "images", "georeferenced", "georeferenced_map.tif")
+DISPLAY_SIZE = (1920, 1080)
+
+
+# ------- Previous Implementation -------
+def legacy_write(path, image, meta, transform):
+    # What georeference_image wrote: the input's own meta with a new transform and CRS
+    meta = dict(meta, transform=transform, crs="WGS84", count=3)
+    with rasterio.open(path, "w", **meta) as dst:
+        for i in range(3):
+            dst.write(image[:, :, i], i + 1)
+
+
+def prewarp_copy(source_path, path, transform):
+    with rasterio.open(source_path) as src:
+        copy_geotiff(path, src, transform, DISPLAY_SIZE)
+
+
+def best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def open_and_read(path, size=None):
+    with rasterio.open(path) as src:
+        if size is None:
+            return src.read()
+        return src.read(out_shape=(src.count, size[1], size[0]), resampling=Resampling.bilinear)
+
+
+def load_source(scale):
+    """The sample map, optionally upscaled to stand in for a large scanned chart, as a plain striped GTiff."""
+    with rasterio.open(IMAGE_PATH) as src:
+        image = np.transpose(src.read([1, 2, 3]), (1, 2, 0))
+        bounds = src.bounds
+    if scale != 1:
+        image = np.repeat(np.repeat(image, scale, axis=0), scale, axis=1)
+    height, width = image.shape[:2]
+    meta = {"driver": "GTiff", "width": width, "height": height, "count": 3, "dtype": "uint8"}
+    return image, meta, from_bounds(*bounds, width, height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Size and open time of the georeference tool's GeoTIFF output.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4], help="upscale factors of the sample map")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scale:
+            image, meta, transform = load_source(scale)
+            height, width = image.shape[:2]
+            outputs = {
+                "legacy": os.path.join(tmp, f"legacy_{scale}.tif"),
+                "tiled": os.path.join(tmp, f"tiled_{scale}.tif"),
+                "prewarped": os.path.join(tmp, f"prewarped_{scale}.tif"),
+            }
+            write_times = {
+                "legacy": best_of(lambda: legacy_write(outputs["legacy"], image, meta, transform), repeat=1),
+                "tiled": best_of(lambda: write_geotiff(outputs["tiled"], image, transform), repeat=1),
+                "prewarped": best_of(lambda: prewarp_copy(outputs["legacy"], outputs["prewarped"], transform), repeat=1),
+            }
+
+            print(f"\n{width}x{height} source ({image.nbytes / 2**20:.0f} MB raw)")
+            print(f"  {'output':<10}{'file MB':>9}{'write s':>9}{'open+read full ms':>19}{'open+read display ms':>22}")
+            for name, path in outputs.items():
+                size_mb = os.path.getsize(path) / 2**20
+                full = best_of(lambda: open_and_read(path))
+                display = best_of(lambda: open_and_read(path, DISPLAY_SIZE))
+                print(f"  {name:<10}{size_mb:>9.1f}{write_times[name]:>9.2f}{full * 1000:>19.1f}{display * 1000:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
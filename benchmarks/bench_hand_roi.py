@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+import argparse
+import cv2
+import mediapipe as mp
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.interactive.hand_tracking import detect_hands, roi_from_polygon, ROI_MARGIN
+
+COORDINATES_PATH = os.path.join(PROJECT_ROOT, "data", "json", "coordinates.json")
+DEFAULT_WIDTHS = [0, 640, 480, 320, 240]
+
+
+def load_clip(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.flip(frame, 1))
+    cap.release()
+    return frames
+
+
+def camera_polygon():
+    with open(COORDINATES_PATH, 'r') as f:
+        camera = json.load(f)["camera"]
+    tl, br = camera["tl_corner"], camera["br_corner"]
+    return [tl, [br[0], tl[1]], br, [tl[0], br[1]]]
+
+
+def run(frames, roi, inference_width):
+    # A fresh instance per run so tracking state does not leak between configurations
+    with mp.solutions.hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7) as hands:
+        detected = 0
+        start = time.perf_counter()
+        for frame in frames:
+            if len(detect_hands(hands, frame, roi, inference_width)):
+                detected += 1
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000 / len(frames), detected / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand inference cost and detection rate for ROI crops and resolutions.")
+    parser.add_argument("clips", nargs="+", help="recorded webcam clips (any format OpenCV can read)")
+    parser.add_argument("--widths", type=int, nargs="+", default=DEFAULT_WIDTHS,
+                        help="inference widths to test; 0 keeps the crop resolution")
+    parser.add_argument("--margin", type=int, default=ROI_MARGIN)
+    parser.add_argument("--max-frames", type=int, default=600)
+    args = parser.parse_args()
+
+    polygon = camera_polygon()
+    print(f"{'clip':<24} | {'input':<18} | {'ms/frame':>8} | {'detected':>8}")
+    for path in args.clips:
+        frames = load_clip(path, args.max_frames)
+        if not frames:
+            print(f"{os.path.basename(path):<24} | no frames")
+            continue
+        roi = roi_from_polygon(polygon, frames[0].shape, args.margin)
+
+        configs = [("full frame", None, None)]
+        for width in args.widths:
+            label = f"roi {roi[2] - roi[0]}px" if not width else f"roi -> {width}px"
+            configs.append((label, roi, width or None))
+
+        for label, config_roi, width in configs:
+            ms, rate = run(frames, config_roi, width)
+            print(f"{os.path.basename(path)[:24]:<24} | {label:<18} | {ms:>8.1f} | {rate:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.interactive.fleet import FleetStore, ShipInfo, FLAG_STALE
+from core.interactive.renderer import MapRenderer, MARKER_RADIUS, STATE_COLORS, BACKGROUND_COLOR, marker_states
+
+SCREEN_SIZE = (1600, 1000)
+MAP_RECT = (40, 20, 1520, 960)
+SIZES = [100, 1_000, 10_000]
+FRAMES = 60
+
+
+def synthetic_fleet(n, rng):
+    fleet = FleetStore()
+    moored = rng.random(n) < 0.3
+    info = [ShipInfo("", f"SHIP {i}", "", "", "Moored" if m else "Under way") for i, m in enumerate(moored.tolist())]
+    fleet.update(np.arange(n) + 200_000_000, np.zeros(n), np.zeros(n), np.ones(n), info)
+    fleet.set_positions(rng.integers(0, MAP_RECT[2], n), rng.integers(0, MAP_RECT[3], n))
+    fleet.flags[:n][rng.random(n) < 0.1] |= FLAG_STALE
+    fleet.select(int(fleet.mmsi[0]))
+    return fleet
+
+
+# ------- Previous Implementation -------
+def draw_circles(screen, rect, fleet):
+    ox, oy = rect.topleft
+    xs, ys, flags = fleet.column("x"), fleet.column("y"), fleet.column("flags")
+    screen.set_clip(rect)
+    for x, y, state in zip(xs.tolist(), ys.tolist(), marker_states(flags).tolist()):
+        pygame.draw.circle(screen, STATE_COLORS[state], (ox + x, oy + y), MARKER_RADIUS)
+    screen.set_clip(None)
+
+
+def timed(func):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        func()
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (MAP_RECT[2] // 4, MAP_RECT[3] // 4, 3), dtype=np.uint8)
+    renderer = MapRenderer(screen, image, MAP_RECT)
+
+    print(f"{'ships':>6} | {'draw.circle':>18} | {'sprite blits':>18} | speed-up")
+    for n in SIZES:
+        fleet = synthetic_fleet(n, rng)
+
+        # Both variants repaint the map and every marker, i.e. the full-refresh path
+        def circles():
+            screen.fill(BACKGROUND_COLOR)
+            screen.blit(renderer.base, renderer.rect)
+            draw_circles(screen, renderer.rect, fleet)
+
+        def sprites():
+            renderer.full_refresh = True
+            renderer.begin_frame()
+            renderer.draw_markers(fleet)
+
+        circles()
+        reference = pygame.surfarray.array3d(screen)
+        sprites()
+        assert np.array_equal(reference, pygame.surfarray.array3d(screen)), "sprites differ from draw.circle"
+
+        legacy = timed(circles)
+        batched = timed(sprites)
+        print(f"{n:>6} | {legacy * 1000:>6.2f} ms {1 / legacy:>6.0f} fps | "
+              f"{batched * 1000:>6.2f} ms {1 / batched:>6.0f} fps | {legacy / batched:>6.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import numpy as np
+import rasterio
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.interactive.projection import MapProjection
+
+IMAGE_PATH = os.path.join(PROJECT_ROOT, "data", "images", "georeferenced", "georeferenced_map.tif")
+TARGET_SIZE = (1280, 720)
+SIZES = [10, 1_000, 100_000]
+
+
+# ------- Previous Implementation -------
+def legacy_geo_to_pixel(lat, lon, transform, src_width, src_height, width, height):
+    row, col = rasterio.transform.rowcol(transform, lon, lat)
+    return int(col * width / src_width), int(row * height / src_height)
+
+
+def best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    with rasterio.open(IMAGE_PATH) as src:
+        transform = src.transform
+        src_width, src_height = src.width, src.height
+        bounds = src.bounds
+
+    width, height = TARGET_SIZE
+    projection = MapProjection(transform, src_width, src_height, width, height)
+    rng = np.random.default_rng(0)
+
+    print(f"{'positions':>10} | {'rowcol loop':>14} | {'vectorized':>14} | {'speedup':>8}")
+    for n in SIZES:
+        lat = rng.uniform(bounds.bottom, bounds.top, n)
+        lon = rng.uniform(bounds.left, bounds.right, n)
+
+        legacy = best_of(lambda: [
+            legacy_geo_to_pixel(la, lo, transform, src_width, src_height, width, height)
+            for la, lo in zip(lat, lon)
+        ], repeat=1 if n > 10_000 else 3)
+        batch = best_of(lambda: projection.geo_to_pixel(lat, lon))
+
+        print(f"{n:>10} | {n / legacy:>10.0f} /s | {n / batch:>10.0f} /s | {legacy / batch:>7.0f}x")
+
+    # Round trip through the inverse must land back inside the same pixel
+    x, y = projection.geo_to_pixel(lat, lon)
+    back_lat, back_lon = projection.pixel_to_geo(x + 0.5, y + 0.5)
+    bx, by = projection.geo_to_pixel(back_lat, back_lon)
+    print(f"Inverse round trip exact: {np.array_equal(x, bx) and np.array_equal(y, by)}")
+
+
+if __name__ == "__main__":
+    main()
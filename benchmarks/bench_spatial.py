@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.interactive.spatial import GridIndex
+from core.interactive.fleet import GRID_CELL_SIZE
+
+MAP_SIZE = (1600, 1000)
+SIZES = [10, 100, 1_000, 10_000, 50_000]
+QUERIES = 200
+RADIUS = 20
+
+
+# ------- Previous Implementation -------
+def is_near_ship(ship_pos, x, y, threshold=20):
+    ship_x, ship_y = ship_pos
+    return np.hypot(ship_x - x, ship_y - y) <= threshold
+
+
+def legacy_hit(ships, x, y):
+    for mmsi, pos in ships:
+        if is_near_ship(pos, x, y, RADIUS):
+            return mmsi
+    return None
+
+
+def linear_hit(xs, ys, x, y):
+    dx = xs - x
+    dy = ys - y
+    dist_sq = dx * dx + dy * dy
+    row = int(np.argmin(dist_sq))
+    return row if dist_sq[row] <= RADIUS * RADIUS else None
+
+
+def per_query(func, queries):
+    start = time.perf_counter()
+    for x, y in queries:
+        func(x, y)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    queries = list(zip(rng.integers(0, MAP_SIZE[0], QUERIES).tolist(), rng.integers(0, MAP_SIZE[1], QUERIES).tolist()))
+
+    print(f"{'ships':>7} | {'tuple loop':>11} | {'numpy scan':>11} | {'grid query':>11} | {'grid build':>11}")
+    for n in SIZES:
+        xs = rng.integers(0, MAP_SIZE[0], n).astype(np.int32)
+        ys = rng.integers(0, MAP_SIZE[1], n).astype(np.int32)
+        ships = list(zip(range(n), zip(xs.tolist(), ys.tolist())))
+
+        grid = GridIndex(GRID_CELL_SIZE)
+        start = time.perf_counter()
+        grid.build(xs, ys)
+        build = time.perf_counter() - start
+
+        # The tuple loop stops at the first hit, so it is timed on a subset for big fleets
+        legacy_queries = queries if n <= 1_000 else queries[:10]
+        legacy = per_query(lambda x, y: legacy_hit(ships, x, y), legacy_queries)
+        linear = per_query(lambda x, y: linear_hit(xs, ys, x, y), queries)
+        indexed = per_query(lambda x, y: grid.nearest(x, y, RADIUS), queries)
+
+        for x, y in queries:
+            a, b = linear_hit(xs, ys, x, y), grid.nearest(x, y, RADIUS)
+            assert (a is None) == (b is None), "grid and linear scan disagree"
+
+        print(f"{n:>7} | {legacy * 1e6:>8.1f} us | {linear * 1e6:>8.1f} us | "
+              f"{indexed * 1e6:>8.1f} us | {build * 1e3:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
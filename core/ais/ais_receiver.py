@@ -1,18 +1,28 @@
 import os
+import io
 import sys
 import serial
 import requests
 from bs4 import BeautifulSoup
 from pyais import decode
 from datetime import datetime
+from PIL import Image, ImageDraw
 
-PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-from core.database.db_setup import load_credentials
+from core.database.db_setup import load_credentials, migrate_ship_table
 
 SERIAL_PORT = "COM5"
 BAUD_RATE = 4800
-IMAGE_DIR = os.path.join(PROJECT_ROOT,"data" "images", "ships")
+IMAGE_DIR = os.path.join(PROJECT_ROOT, "data", "images", "ships")
+THUMBNAIL_DIR = os.path.join(IMAGE_DIR, "thumbnails")
+PLACEHOLDER_PATH = os.path.join(THUMBNAIL_DIR, "placeholder.jpg")
+
+THUMBNAIL_SIZE = (210, 80)   # image slot of the info card
+THUMBNAIL_QUALITY = 85
+KEEP_ORIGINALS = False       # opt-in: also store full-size photos in IMAGE_DIR (several times the disk use)
 
 # ------- Database Connection -------
 def connect_database(credentials):
@@ -88,20 +98,53 @@ def fetch_ship_details(mmsi):
     return name, image_url, nav_status, destination, eta
 
 def save_ship_image(mmsi, url):
-    os.makedirs(IMAGE_DIR, exist_ok=True)
-    local_path = os.path.join(IMAGE_DIR, f"{mmsi}.jpg")
+    """
+    Download a ship photo and store a card-sized JPEG thumbnail of it.
+
+    Returns (image_path, thumbnail_path, width, height). image_path is None
+    when KEEP_ORIGINALS is off; without a usable photo the shared
+    placeholder is returned as the thumbnail.
+    """
+    image_path = None
+    original_path = os.path.join(IMAGE_DIR, f"{mmsi}.jpg")
+    thumbnail_path = os.path.join(THUMBNAIL_DIR, f"{mmsi}.jpg")
+    if os.path.exists(thumbnail_path) and (not KEEP_ORIGINALS or os.path.exists(original_path)):
+        # Photos rarely change; every AIS message of a ship would otherwise download it again
+        if KEEP_ORIGINALS:
+            image_path = original_path
+        return (image_path, thumbnail_path) + THUMBNAIL_SIZE
 
     try:
-        response = requests.get(url, stream=True)
+        response = requests.get(url, timeout=10)
         if response.status_code == 200:
-            with open(local_path, 'wb') as file:
-                for chunk in response.iter_content(1024):
-                    file.write(chunk)
-            return local_path
-    except Exception:
-        pass  
-
-    return None
+            if KEEP_ORIGINALS:
+                os.makedirs(IMAGE_DIR, exist_ok=True)
+                image_path = original_path
+                with open(image_path, 'wb') as file:
+                    file.write(response.content)
+            return (image_path,) + save_thumbnail(Image.open(io.BytesIO(response.content)), thumbnail_path)
+    except Exception as err:
+        print(f"Ship image failed: {err}")
+
+    return (image_path,) + placeholder_thumbnail()
+
+# ------- Thumbnails -------
+def save_thumbnail(image, path):
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    thumbnail = image.convert("RGB").resize(THUMBNAIL_SIZE, Image.LANCZOS)
+    thumbnail.save(path, "JPEG", quality=THUMBNAIL_QUALITY)
+    return (path,) + THUMBNAIL_SIZE
+
+def placeholder_thumbnail():
+    if not os.path.exists(PLACEHOLDER_PATH):
+        image = Image.new("RGB", THUMBNAIL_SIZE, (230, 230, 230))
+        draw = ImageDraw.Draw(image)
+        text = "No image"
+        left, top, right, bottom = draw.textbbox((0, 0), text)
+        position = ((THUMBNAIL_SIZE[0] - right + left) // 2, (THUMBNAIL_SIZE[1] - bottom + top) // 2)
+        draw.text(position, text, fill=(100, 100, 100))
+        save_thumbnail(image, PLACEHOLDER_PATH)
+    return (PLACEHOLDER_PATH,) + THUMBNAIL_SIZE
 
 # ------- Main Loop -------
 def main():
@@ -114,6 +157,7 @@ def main():
 
     credentials = load_credentials()
     conn, cursor = connect_database(credentials)
+    migrate_ship_table(conn, cursor)
     print(f"Connected to {credentials['engine']} database.")
     print("--------------------------------------------------\n")
 
@@ -131,26 +175,34 @@ def main():
                 lat = msg.lat
                 lon = msg.lon
                 speed = msg.speed
+                course = getattr(msg, "course", None)    # degrees over ground, 360 = not available
+                heading = getattr(msg, "heading", None)  # degrees true, 511 = not available
 
                 name, image_url, nav_status, destination, eta = fetch_ship_details(mmsi)
-                image_path = save_ship_image(mmsi, image_url) if image_url else None
+                if image_url:
+                    image_path, thumbnail_path, thumbnail_width, thumbnail_height = save_ship_image(mmsi, image_url)
+                else:
+                    image_path = None
+                    thumbnail_path, thumbnail_width, thumbnail_height = placeholder_thumbnail()
 
                 print(f"{timestamp} | MMSI {mmsi} - {name or 'Unknown'}")
-                print(f"Position: ({lat}, {lon}) | Speed: {speed}")
+                print(f"Position: ({lat}, {lon}) | Speed: {speed} | Course: {course} | Heading: {heading}")
                 if destination:
                     print(f"Destination: {destination} | ETA: {eta}")
                 if nav_status:
                     print(f"Navigation Status: {nav_status}")
-                print("Image:", "Downloaded" if image_path else "Not available")
+                print("Image:", "Downloaded" if thumbnail_path != PLACEHOLDER_PATH else "Not available")
 
                 cursor.execute(
                     """
                     INSERT INTO ships (
-                        timestamp, mmsi, latitude, longitude, speed,
-                        name, image_path, navigation_status, destination, eta
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        timestamp, mmsi, latitude, longitude, speed, course, heading,
+                        name, image_path, navigation_status, destination, eta,
+                        thumbnail_path, thumbnail_width, thumbnail_height
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """,
-                    (timestamp, mmsi, lat, lon, speed, name, image_path, nav_status, destination, eta)
+                    (timestamp, mmsi, lat, lon, speed, course, heading, name, image_path, nav_status, destination, eta,
+                     thumbnail_path, thumbnail_width, thumbnail_height)
                 )
                 conn.commit()
                 print("Inserted into database.")
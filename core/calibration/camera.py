@@ -12,6 +12,7 @@ if PROJECT_ROOT not in sys.path:
 from gui.gui_components import (
     PRIMARY_COLOR, SECONDARY_COLOR, SECONDARY_HOVER
 )
+from core.interactive.capture import LatestFrameCapture
 
 COORDINATES_PATH = os.path.join(PROJECT_ROOT, "data", "json", "coordinates.json")
 
@@ -141,7 +142,7 @@ def select_rectangle(event, x, y, flags, param):
 def camera_calibration():
     global rectangle_top_left_corner, rectangle_bottom_right_corner
 
-    cap = cv2.VideoCapture(0)
+    cap = LatestFrameCapture(0)
     if not cap.isOpened():
         show_error("Error", "No camera detected.")
         return
@@ -3,10 +3,9 @@ import sys
 import json
 import ctypes
 from ctypes import wintypes
-import numpy as np
 import pygame
-import rasterio
 import customtkinter as ctk
+from affine import Affine
 
 # ------- Paths & Setup -------
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -16,10 +15,14 @@ if PROJECT_ROOT not in sys.path:
 from gui.gui_components import (
     PRIMARY_COLOR, SECONDARY_COLOR, SECONDARY_HOVER
 )
+from core.georeference.map_cache import load_map_asset, map_surface
 
 COORDINATES_PATH = os.path.join(PROJECT_ROOT, "data", "json", "coordinates.json")
 IMAGE_PATH = os.path.join(PROJECT_ROOT, "data", "images", "georeferenced", "georeferenced_map.tif")
 
+# Resampling used to warp the map into the calibrated projector rect, once, when calibration is saved
+MAP_RESAMPLING = "lanczos"
+
 
 # ------- Popup Windows -------
 def show_success(title, msg):
@@ -130,17 +133,11 @@ def move_window_to_monitor(monitor_index):
 # ------- Calibration Logic -------
 def projector_calibration():
     try:
-        with rasterio.open(IMAGE_PATH) as src:
-            raw = src.read()
+        asset = load_map_asset(IMAGE_PATH)
     except Exception as e:
         show_error("Error", f"Failed to load georeferenced image:\n{e}")
         return
 
-    image_data = np.transpose(raw[:3], (1, 2, 0)).astype(np.uint8)
-    image_data = np.flipud(np.rot90(image_data, 3))
-    image_data = np.fliplr(image_data)
-    image_data = np.flipud(image_data)
-
     pygame.init()
     monitor_index = int(os.environ.get("SDL_VIDEO_FULLSCREEN_DISPLAY", "0"))
     os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"] = str(monitor_index)
@@ -151,7 +148,7 @@ def projector_calibration():
     if sys.platform.startswith("win"):
         move_window_to_monitor(monitor_index)
 
-    original = pygame.surfarray.make_surface(image_data)
+    original = map_surface(asset.pixels)
     image_surface = original.copy()
     image_x = image_y = 0
     scale_factor = 1.0
@@ -212,7 +209,28 @@ def projector_calibration():
     if save:
         tl = (image_x, image_y)
         br = (image_x + image_surface.get_width(), image_y + image_surface.get_height())
-        save_coordinates_to_json(projector_coordinatess={"tl_corner": tl, "br_corner": br})
+        size = image_surface.get_size()
+
+        # Geo coordinates straight to screen pixels, and the map warped into that rect now,
+        # so the display only maps the result at startup
+        geo_to_screen = (Affine.translation(*tl)
+                         * Affine.scale(size[0] / asset.src_width, size[1] / asset.src_height)
+                         * ~asset.transform)
+        try:
+            load_map_asset(IMAGE_PATH, size, MAP_RESAMPLING)
+        except Exception as e:
+            show_error("Error", f"Failed to warp the map to the projector:\n{e}")
+            return
+
+        save_coordinates_to_json(projector_coordinatess={
+            "tl_corner": tl,
+            "br_corner": br,
+            "geo_to_screen": list(geo_to_screen)[:6],
+            # The map geo_to_screen was composed from; a re-georeferenced map invalidates it
+            "map_transform": list(asset.transform)[:6],
+            "map_size": [asset.src_width, asset.src_height],
+            "resampling": MAP_RESAMPLING,
+        })
         show_success("Success", "Projector calibration saved.")
 
 
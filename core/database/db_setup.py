@@ -28,14 +28,37 @@ SHIP_TABLE_SQL = """
         latitude {latlon_type},
         longitude {latlon_type},
         speed {speed_type},
+        course {speed_type},
+        heading INT,
         image_path TEXT,
         name TEXT,
         destination TEXT,
         eta TEXT,
-        navigation_status TEXT
+        navigation_status TEXT,
+        thumbnail_path TEXT,
+        thumbnail_width INT,
+        thumbnail_height INT
     );
 """
 
+# Columns added after the first release; applied to tables created by older versions
+SHIP_TABLE_MIGRATIONS = [
+    "ALTER TABLE ships ADD COLUMN thumbnail_path TEXT",
+    "ALTER TABLE ships ADD COLUMN thumbnail_width INT",
+    "ALTER TABLE ships ADD COLUMN thumbnail_height INT",
+    "ALTER TABLE ships ADD COLUMN course NUMERIC(5,2)",
+    "ALTER TABLE ships ADD COLUMN heading INT",
+]
+
+def migrate_ship_table(conn, cur):
+    for statement in SHIP_TABLE_MIGRATIONS:
+        try:
+            cur.execute(statement)
+            conn.commit()
+        except Exception:
+            # Column already exists
+            conn.rollback()
+
 # ------- Setup Database Function -------
 def setup_database(config):
     """
@@ -65,6 +88,7 @@ def setup_database(config):
             ))
 
             conn.commit()
+            migrate_ship_table(conn, cur)
             cur.close()
             conn.close()
 
@@ -89,6 +113,7 @@ def setup_database(config):
             ))
 
             conn.commit()
+            migrate_ship_table(conn, cur)
             cur.close()
             conn.close()
 
@@ -1,21 +1,35 @@
 import os
+import sys
+import math
 import warnings
 import tkinter as tk
 from tkinter import filedialog, simpledialog, messagebox
 
-import numpy as np
 from PIL import Image, ImageTk
-import rasterio
 from rasterio.errors import NotGeoreferencedWarning
 from rasterio.control import GroundControlPoint
-from rasterio.crs import CRS
 from rasterio.transform import from_gcps
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.georeference.geotiff import copy_geotiff, projector_size
+from core.georeference.pyramid import ImagePyramid
+
 warnings.filterwarnings("ignore", category=NotGeoreferencedWarning)
 
 WINDOW_TITLE = "Georeference Tool"
 WINDOW_SIZE = "1400x900"
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..','..', 'images', 'georeferenced')
+
+# Canvas rendering: only the visible part of the image (plus a margin, so short
+# pans just move it) is resampled; interaction uses a fast filter and a
+# high-quality pass follows once the view has been still for SETTLE_DELAY ms
+RENDER_MARGIN = 256
+SETTLE_DELAY = 150
+FAST_RESAMPLE = Image.NEAREST
+FINAL_RESAMPLE = Image.LANCZOS
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'data', 'images', 'georeferenced')
 OUTPUT_PATH = os.path.join(OUTPUT_DIR, 'georeferenced_map.tif')
 
 
@@ -37,14 +51,15 @@ class GeoreferencingApp:
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
         # Image data & tracking
-        self.raw_image_array = None
+        self.pyramid = None
         self.tk_image = None
         self.image_on_canvas = None
-        self.meta = None
 
         self.scale = 1.0
         self.offset_x = 0
         self.offset_y = 0
+        self.rendered = None  # (region, resample) currently on the canvas
+        self.settle_job = None
 
         self.clicked_points = []  
         self.counter_text_id = None
@@ -54,6 +69,7 @@ class GeoreferencingApp:
         self.canvas.bind("<ButtonPress-3>", self.start_drag) # Right click to start dragging
         self.canvas.bind("<B3-Motion>", self.perform_drag) # Drag to move image
         self.canvas.bind("<MouseWheel>", self.handle_zoom) # Mouse wheel to zoom
+        self.canvas.bind("<Configure>", lambda event: self.schedule_settle()) # Window resized
 
         self.root.protocol("WM_DELETE_WINDOW", self.confirm_exit)
         self.root.after(100, self.open_image)
@@ -73,16 +89,8 @@ class GeoreferencingApp:
             return
 
         try:
-            with rasterio.open(path) as src:
-                img = src.read()
-                self.meta = src.meta.copy()
-
-                if img.shape[0] == 1:
-                    img = np.repeat(img, 3, axis=0)
-
-                img = np.transpose(img[:3], (1, 2, 0))
-                self.raw_image_array = img.astype(np.uint8)
-
+            # Only the tiles in view are ever read, at the resolution they are shown at
+            self.pyramid = ImagePyramid(path)
             self.display_image()
 
         except Exception as e:
@@ -92,23 +100,69 @@ class GeoreferencingApp:
             if self.parent:
                 self.parent.deiconify()
 
-    def display_image(self):        
-        img_pil = Image.fromarray(self.raw_image_array)
-        w, h = img_pil.size
-        img_scaled = img_pil.resize((int(w * self.scale), int(h * self.scale)), Image.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(img_scaled)
-
-        if self.image_on_canvas:
-            self.canvas.delete(self.image_on_canvas)
-
-        self.image_on_canvas = self.canvas.create_image(
-            self.offset_x, self.offset_y, image=self.tk_image, anchor='nw'
-        )
-        self.canvas.image = self.tk_image
-
+    def display_image(self, resample=FINAL_RESAMPLE):
+        region = self.visible_region(RENDER_MARGIN)
+        x0, y0, x1, y1 = region
+
+        if x1 <= x0 or y1 <= y0:
+            # Dragged entirely out of view
+            if self.image_on_canvas:
+                self.canvas.delete(self.image_on_canvas)
+                self.image_on_canvas = None
+        else:
+            factor = self.pyramid.level(self.scale)
+            pixels, (left, top) = self.pyramid.region(factor, x0, y0, x1, y1)
+            crop = Image.fromarray(pixels)
+            size = (max(1, round(crop.width * factor * self.scale)), max(1, round(crop.height * factor * self.scale)))
+            self.tk_image = ImageTk.PhotoImage(crop.resize(size, resample))
+            x = self.offset_x + left * self.scale
+            y = self.offset_y + top * self.scale
+
+            if self.image_on_canvas:
+                self.canvas.itemconfigure(self.image_on_canvas, image=self.tk_image)
+                self.canvas.coords(self.image_on_canvas, x, y)
+            else:
+                self.image_on_canvas = self.canvas.create_image(x, y, image=self.tk_image, anchor='nw')
+                self.canvas.tag_lower(self.image_on_canvas)
+            self.canvas.image = self.tk_image
+
+        self.rendered = (region, resample)
         self.redraw_points()
         self.update_counter()
 
+    def visible_region(self, margin=0):
+        """Image pixels (x0, y0, x1, y1) under the canvas, extended by margin canvas pixels."""
+        w, h = self.pyramid.width, self.pyramid.height
+        canvas_w, canvas_h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        x0 = math.floor((-margin - self.offset_x) / self.scale)
+        y0 = math.floor((-margin - self.offset_y) / self.scale)
+        x1 = math.ceil((canvas_w + margin - self.offset_x) / self.scale)
+        y1 = math.ceil((canvas_h + margin - self.offset_y) / self.scale)
+        return max(0, x0), max(0, y0), min(w, x1), min(h, y1)
+
+    def covers_view(self):
+        if self.rendered is None:
+            return False
+        (rx0, ry0, rx1, ry1), _ = self.rendered
+        x0, y0, x1, y1 = self.visible_region()
+        if x1 <= x0 or y1 <= y0:
+            return True
+        return rx0 <= x0 and ry0 <= y0 and x1 <= rx1 and y1 <= ry1
+
+    def schedule_settle(self):
+        if self.pyramid is None:
+            return
+        if self.settle_job is not None:
+            self.root.after_cancel(self.settle_job)
+        self.settle_job = self.root.after(SETTLE_DELAY, self.settle)
+
+    def settle(self):
+        self.settle_job = None
+        if self.pyramid is None:
+            return
+        if self.rendered != (self.visible_region(RENDER_MARGIN), FINAL_RESAMPLE):
+            self.display_image(FINAL_RESAMPLE)
+
     # ------- Click to Add Point -------
     def handle_click(self, event):
         canvas_x, canvas_y = event.x, event.y
@@ -199,24 +253,25 @@ class GeoreferencingApp:
 
     # ------- Redraw All Points After Zoom/Scale -------
     def redraw_points(self):
-        for i, ((img_x, img_y), coords, old_dot_id) in enumerate(self.clicked_points):
-            self.canvas.delete(old_dot_id)
+        for (img_x, img_y), _, dot_id in self.clicked_points:
             x = self.offset_x + img_x * self.scale
             y = self.offset_y + img_y * self.scale
-            new_dot_id = self.canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill='red', outline='red')
-            self.clicked_points[i] = ((img_x, img_y), coords, new_dot_id)
+            self.canvas.coords(dot_id, x - 3, y - 3, x + 3, y + 3)
 
     def update_counter(self):
         count = len(self.clicked_points)
-        if self.tk_image:
-            x = self.offset_x + self.tk_image.width() - 10
+        if self.pyramid is not None:
+            # Top right corner of the whole image, not just the rendered crop
+            x = self.offset_x + self.pyramid.width * self.scale - 10
             y = self.offset_y + 10
             if self.counter_text_id:
-                self.canvas.delete(self.counter_text_id)
-            self.counter_text_id = self.canvas.create_text(
-                x, y, anchor='ne', text=f"Points: {count}/4", fill='black',
-                font=('Arial', 14, 'bold')
-            )
+                self.canvas.coords(self.counter_text_id, x, y)
+                self.canvas.itemconfigure(self.counter_text_id, text=f"Points: {count}/4")
+            else:
+                self.counter_text_id = self.canvas.create_text(
+                    x, y, anchor='ne', text=f"Points: {count}/4", fill='black',
+                    font=('Arial', 14, 'bold')
+                )
 
     # ------- Drag Image -------
     def start_drag(self, event):
@@ -230,11 +285,17 @@ class GeoreferencingApp:
         self.offset_y += dy
         self.last_drag_x = event.x
         self.last_drag_y = event.y
-        self.display_image()
+
+        # A pan only shifts what is already drawn; resample once it runs past the rendered margin
+        self.canvas.move("all", dx, dy)
+        if not self.covers_view():
+            self.display_image(FAST_RESAMPLE)
+        self.schedule_settle()
 
     def handle_zoom(self, event):
         self.scale *= 1.1 if event.delta > 0 else 0.9
-        self.display_image()
+        self.display_image(FAST_RESAMPLE)
+        self.schedule_settle()
 
     # ------- Save Georeferenced Image -------
     def georeference_image(self):
@@ -245,16 +306,26 @@ class GeoreferencingApp:
 
         os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+        # Written next to the output first: the source may be the current map itself
+        tmp_path = OUTPUT_PATH + ".tmp"
+        source_path = self.pyramid.path
         try:
-            self.meta.update({
-                'transform': from_gcps(gcps),
-                'crs': CRS.from_string('WGS84'),
-                'count': 3
-            })
+            transform = from_gcps(gcps)
+
+            # Optionally resample once to the projector resolution so the display reads it 1:1
+            size = projector_size()
+            if not size or size == (self.pyramid.width, self.pyramid.height) or not messagebox.askyesno(
+                    "Projector Resolution",
+                    f"Resample the map to the projector resolution ({size[0]}x{size[1]})?",
+                    parent=self.root):
+                size = None
+
+            copy_geotiff(tmp_path, self.pyramid.dataset, transform, size)
 
-            with rasterio.open(OUTPUT_PATH, 'w', **self.meta) as dst:
-                for i in range(3):
-                    dst.write(self.raw_image_array[:, :, i], i + 1)
+            # Closed first: Windows cannot replace a file GDAL still holds open
+            self.pyramid.close()
+            self.pyramid = None
+            os.replace(tmp_path, OUTPUT_PATH)
 
             messagebox.showinfo("Success", "Georeferenced image saved")
             self.root.destroy()
@@ -262,6 +333,11 @@ class GeoreferencingApp:
                 self.parent.deiconify()
 
         except Exception as e:
+            # The source is kept (or reopened) so the points can be saved again
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if self.pyramid is None:
+                self.pyramid = ImagePyramid(source_path)
             messagebox.showerror("Error", f"Failed to save georeferenced image:\n{e}")
 
     # ------- Exit Handler -------
@@ -269,6 +345,8 @@ class GeoreferencingApp:
         if len(self.clicked_points) < 4:
             if not messagebox.askyesno("Exit Confirmation", "You haven't selected all 4 points.\nExit anyway?"):
                 return
+        if self.pyramid is not None:
+            self.pyramid.close()
         self.root.destroy()
         if self.parent:
             self.parent.destroy()
@@ -0,0 +1,193 @@
+import os
+import sys
+import csv
+import json
+import time
+import glob
+import argparse
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import rasterio
+from rasterio.control import GroundControlPoint
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.transform import from_gcps
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.georeference.geotiff import copy_geotiff, projector_size
+
+warnings.filterwarnings("ignore", category=NotGeoreferencedWarning)
+
+GCP_EXTENSIONS = [".csv", ".json"]
+METERS_PER_DEGREE = 1852.0 * 60
+
+# residuals: per point (dx_px, dy_px, error_px, error_m)
+BatchResult = namedtuple("BatchResult", "image output points residuals rms_px rms_m seconds")
+
+
+# ------- Ground Control Points -------
+def read_gcps(path):
+    """
+    Ground control points as [((px, py), (lat, lon)), ...].
+
+    CSV files need a px,py,lat,lon header. JSON files hold a list of
+    {"px", "py", "lat", "lon"} objects, either at the top level or under
+    "points".
+    """
+    if path.lower().endswith(".json"):
+        with open(path, "r") as f:
+            data = json.load(f)
+        rows = data["points"] if isinstance(data, dict) else data
+    else:
+        with open(path, "r", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    points = [((float(r["px"]), float(r["py"])), (float(r["lat"]), float(r["lon"]))) for r in rows]
+    if len(points) < 3:
+        raise ValueError(f"{os.path.basename(path)}: need at least 3 control points, got {len(points)}")
+    return points
+
+
+def find_gcps(image_path, gcp_dir=None):
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    directory = gcp_dir or os.path.dirname(image_path)
+    for extension in GCP_EXTENSIONS:
+        path = os.path.join(directory, stem + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# ------- Fit -------
+def fit_transform(points):
+    """Least-squares affine transform through the points, with the residual of each point."""
+    gcps = [GroundControlPoint(row=py, col=px, x=lon, y=lat) for (px, py), (lat, lon) in points]
+    transform = from_gcps(gcps)
+
+    pixels = np.array([p for p, _ in points], dtype=np.float64)
+    geo = np.array([g for _, g in points], dtype=np.float64)
+    a, b, c, d, e, f = (~transform)[:6]
+    fit_x = a * geo[:, 1] + b * geo[:, 0] + c
+    fit_y = d * geo[:, 1] + e * geo[:, 0] + f
+    dx, dy = fit_x - pixels[:, 0], fit_y - pixels[:, 1]
+
+    a, b, c, d, e, f = transform[:6]
+    lon = a * pixels[:, 0] + b * pixels[:, 1] + c
+    lat = d * pixels[:, 0] + e * pixels[:, 1] + f
+    meters = np.hypot((lat - geo[:, 0]) * METERS_PER_DEGREE,
+                      (lon - geo[:, 1]) * METERS_PER_DEGREE * np.cos(np.radians(geo[:, 0])))
+
+    residuals = list(zip(dx.tolist(), dy.tolist(), np.hypot(dx, dy).tolist(), meters.tolist()))
+    return transform, residuals
+
+
+def georeference(image_path, gcp_path, output_path, size=None, max_rms=None):
+    """Fit one image to its control points and write the GeoTIFF; runs in a worker process."""
+    start = time.perf_counter()
+    points = read_gcps(gcp_path)
+    transform, residuals = fit_transform(points)
+    errors = np.array([r[2:] for r in residuals])
+    rms_px, rms_m = np.sqrt(np.mean(errors ** 2, axis=0)).tolist()
+    if max_rms is not None and rms_px > max_rms:
+        raise ValueError(f"RMS residual {rms_px:.2f} px exceeds {max_rms:.2f} px, nothing written")
+
+    # Written next to the output first, in case the output replaces its own source
+    tmp_path = output_path + ".tmp"
+    with rasterio.open(image_path) as src:
+        copy_geotiff(tmp_path, src, transform, size)
+    os.replace(tmp_path, output_path)
+    return BatchResult(image_path, output_path, len(points), residuals, rms_px, rms_m,
+                       time.perf_counter() - start)
+
+
+# ------- Report -------
+def print_result(result, verbose):
+    name = os.path.basename(result.image)
+    print(f"{name}: {result.points} points, RMS {result.rms_px:.2f} px / {result.rms_m:.1f} m, "
+          f"{result.seconds:.1f} s -> {result.output}")
+    if verbose:
+        for i, (dx, dy, px, m) in enumerate(result.residuals, 1):
+            print(f"  point {i:>2}: dx {dx:+7.2f} px  dy {dy:+7.2f} px  |{px:6.2f} px  {m:8.1f} m|")
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Georeference map images from ground control point files, several at a time.")
+    parser.add_argument("images", nargs="+", help="image files or glob patterns")
+    parser.add_argument("--gcp-dir", help="directory of <image name>.csv/.json control points (default: next to each image)")
+    parser.add_argument("--output-dir", default=os.path.join(PROJECT_ROOT, "data", "images", "georeferenced"))
+    parser.add_argument("--size", type=parse_size, help="pre-warp every output to WIDTHxHEIGHT")
+    parser.add_argument("--projector", action="store_true", help="pre-warp to the calibrated projector resolution")
+    parser.add_argument("--max-rms", type=float, help="fail images whose RMS residual exceeds this many pixels")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parallel processes")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list the residual of every control point")
+    args = parser.parse_args()
+
+    size = args.size
+    if args.projector:
+        size = projector_size()
+        if size is None:
+            parser.error("no projector calibration in coordinates.json")
+
+    # A file matched by several patterns (maps/*.png maps/naxos.png) is processed once
+    images = []
+    seen = set()
+    for pattern in args.images:
+        for image in sorted(glob.glob(pattern)) or [pattern]:
+            key = os.path.normcase(os.path.abspath(image))
+            if key not in seen:
+                seen.add(key)
+                images.append(image)
+
+    jobs = {}
+    outputs = {}  # normalized output path -> image writing it
+    failed = 0
+    for image in images:
+        gcp_path = find_gcps(image, args.gcp_dir)
+        if gcp_path is None:
+            print(f"{os.path.basename(image)}: no control point file, skipped")
+            failed += 1
+            continue
+        stem = os.path.splitext(os.path.basename(image))[0]
+        output_path = os.path.join(args.output_dir, stem + ".tif")
+
+        # Same name from different folders (a.png, other/a.jpg) would write one output concurrently
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in outputs:
+            print(f"{os.path.basename(image)}: FAILED: output {output_path} already used by {outputs[key]}")
+            failed += 1
+            continue
+        outputs[key] = image
+        jobs[image] = (gcp_path, output_path)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs) or 1))) as pool:
+        futures = {pool.submit(georeference, image, gcp_path, output_path, size, args.max_rms): image
+                   for image, (gcp_path, output_path) in jobs.items()}
+        for future in as_completed(futures):
+            name = os.path.basename(futures[future])
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"{name}: FAILED: {e}")
+                failed += 1
+                continue
+            print_result(result, args.verbose)
+
+    print(f"{len(images) - failed}/{len(images)} maps georeferenced in {time.perf_counter() - start:.1f} s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
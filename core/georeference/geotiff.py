@@ -0,0 +1,112 @@
+import os
+import json
+
+import numpy as np
+import rasterio
+from affine import Affine
+from rasterio.crs import CRS
+from rasterio.enums import Resampling
+from rasterio.windows import Window
+
+# Output profile: 256 px tiles, lossless deflate with horizontal differencing,
+# and internal overviews so consumers can read only the resolution they need
+BLOCK_SIZE = 256
+COMPRESSION = "deflate"
+OVERVIEW_FACTORS = [2, 4, 8, 16, 32, 64]
+OVERVIEW_RESAMPLING = Resampling.average
+PREWARP_RESAMPLING = Resampling.lanczos
+COPY_CACHE_MB = 64  # GDAL block cache while copying; by default it grows to a share of system RAM
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+COORDINATES_PATH = os.path.join(PROJECT_ROOT, "data", "json", "coordinates.json")
+
+
+def projector_size():
+    """(width, height) of the calibrated projector rect, or None before projector calibration."""
+    try:
+        with open(COORDINATES_PATH, "r") as f:
+            projector = json.load(f)["projector"]
+    except (OSError, ValueError, KeyError):
+        return None
+    (left, top), (right, bottom) = projector["tl_corner"], projector["br_corner"]
+    if right <= left or bottom <= top:
+        return None
+    return right - left, bottom - top
+
+
+def geotiff_profile(width, height, transform, crs="WGS84"):
+    profile = {
+        "driver": "GTiff",
+        "width": width,
+        "height": height,
+        "count": 3,
+        "dtype": "uint8",
+        "crs": CRS.from_string(crs) if crs else None,
+        "transform": transform,
+        "photometric": "RGB",
+        "interleave": "pixel",
+        "compress": COMPRESSION,
+        "predictor": 2,
+    }
+    # Blocks must be multiples of 16; tiny rasters stay striped
+    if width >= BLOCK_SIZE and height >= BLOCK_SIZE:
+        profile.update(tiled=True, blockxsize=BLOCK_SIZE, blockysize=BLOCK_SIZE)
+    return profile
+
+
+def overview_factors(width, height):
+    """Overview levels down to the last one still at least one tile across."""
+    return [f for f in OVERVIEW_FACTORS if min(width, height) // f >= BLOCK_SIZE // 2]
+
+
+def rgb_indexes(src):
+    """Band indexes that read a dataset as RGB; single-band images are repeated into grey."""
+    return [1, 2, 3] if src.count >= 3 else [1, 1, 1]
+
+
+def read_rgb(src, window=None, out_shape=None, resampling=Resampling.nearest):
+    """(height, width, 3) uint8 pixels of a dataset window, optionally resampled to out_shape = (height, width)."""
+    if out_shape is not None:
+        out_shape = (3,) + tuple(out_shape)
+    data = src.read(rgb_indexes(src), window=window, out_shape=out_shape, resampling=resampling)
+    if data.dtype != np.uint8:
+        data = np.clip(data, 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(np.transpose(data, (1, 2, 0)))
+
+
+def build_overviews(dst):
+    factors = overview_factors(dst.width, dst.height)
+    if factors:
+        dst.build_overviews(factors, OVERVIEW_RESAMPLING)
+        dst.update_tags(ns="rio_overview", resampling=OVERVIEW_RESAMPLING.name)
+
+
+def write_geotiff(path, image, transform, crs="WGS84"):
+    """Write an (height, width, 3) uint8 image as a tiled, compressed GeoTIFF with internal overviews."""
+    height, width = image.shape[:2]
+    with rasterio.open(path, "w", **geotiff_profile(width, height, transform, crs)) as dst:
+        dst.write(np.transpose(image, (2, 0, 1)))
+        build_overviews(dst)
+
+
+def copy_geotiff(path, src, transform, size=None, crs="WGS84"):
+    """
+    Write an open dataset as a tiled, compressed GeoTIFF with internal overviews.
+
+    The source is copied in strips of BLOCK_SIZE rows, so memory stays bounded
+    however large it is. With size = (width, height) the image is instead
+    pre-warped: read once at that resolution (GDAL uses the source's
+    overviews where it has them) and the transform is rescaled to match.
+    """
+    if size is not None:
+        width, height = size
+        image = read_rgb(src, out_shape=(height, width), resampling=PREWARP_RESAMPLING)
+        write_geotiff(path, image, transform * Affine.scale(src.width / width, src.height / height), crs)
+        return
+
+    with rasterio.Env(GDAL_CACHEMAX=COPY_CACHE_MB):
+        with rasterio.open(path, "w", **geotiff_profile(src.width, src.height, transform, crs)) as dst:
+            for row in range(0, src.height, BLOCK_SIZE):
+                window = Window(0, row, src.width, min(BLOCK_SIZE, src.height - row))
+                dst.write(np.transpose(read_rgb(src, window), (2, 0, 1)), window=window)
+            build_overviews(dst)
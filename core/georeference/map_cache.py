@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+import pygame
+from affine import Affine
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "maps")
+
+CACHE_VERSION = 1
+RESAMPLING = "bilinear"  # default rasterio.enums.Resampling when the cache is warped to another size
+HASH_CHUNK = 1 << 20
+
+# pixels: (height, width, 3) uint8, north-up raster order, C-contiguous and memory-mapped read-only
+MapAsset = namedtuple("MapAsset", "pixels transform src_width src_height")
+
+
+# ------- Cache Files -------
+def cache_paths(source_path, size=None):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    suffix = "native" if size is None else f"{size[0]}x{size[1]}"
+    base = os.path.join(CACHE_DIR, f"{stem}_{suffix}")
+    return base + ".npy", base + ".json"
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_sidecar(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_sidecar(path, meta):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def is_current(meta, source_path, sidecar_path, resampling):
+    """True if the sidecar describes the source as it is on disk now."""
+    if meta is None or meta.get("version") != CACHE_VERSION or meta.get("resampling") != resampling:
+        return False
+    source = meta["source"]
+    stat = os.stat(source_path)
+    if source["size"] != stat.st_size:
+        return False
+    if source["mtime_ns"] == stat.st_mtime_ns:
+        return True
+
+    # Touched or copied but possibly unchanged: compare contents once and remember the new mtime
+    if source["sha256"] != file_hash(source_path):
+        return False
+    source["mtime_ns"] = stat.st_mtime_ns
+    write_sidecar(sidecar_path, meta)
+    return True
+
+
+# ------- Build -------
+def build_cache(source_path, size, resampling, npy_path, sidecar_path):
+    # rasterio (GDAL) is slow to import and only needed when the cache is rebuilt
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.warp import reproject
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if os.path.exists(sidecar_path):
+        os.remove(sidecar_path)
+
+    stat = os.stat(source_path)
+    with rasterio.open(source_path) as src:
+        width, height = size if size is not None else (src.width, src.height)
+        if src.count >= 3:
+            bands = [1, 2, 3]
+        else:
+            bands = [1, 1, 1]
+
+        # Warped into the target grid one band at a time, straight into the memmap,
+        # so only a single band is ever held in memory
+        dst_transform = src.transform * Affine.scale(src.width / width, src.height / height)
+        data = np.empty((height, width), dtype=src.dtypes[0])
+        tmp_path = npy_path + ".tmp"
+        pixels = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8, shape=(height, width, 3))
+        for i, band in enumerate(bands):
+            if (width, height) == (src.width, src.height):
+                data = src.read(band)
+            else:
+                reproject(rasterio.band(src, band), data, dst_transform=dst_transform, dst_crs=src.crs,
+                          resampling=Resampling[resampling])
+            pixels[:, :, i] = np.clip(data, 0, 255)
+        pixels.flush()
+        del pixels
+        os.replace(tmp_path, npy_path)
+
+        meta = {
+            "version": CACHE_VERSION,
+            "source": {
+                "path": os.path.abspath(source_path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": file_hash(source_path),
+            },
+            "width": width,
+            "height": height,
+            "resampling": resampling,
+            "transform": list(src.transform)[:6],
+            "src_width": src.width,
+            "src_height": src.height,
+        }
+    write_sidecar(sidecar_path, meta)
+    return meta
+
+
+# ------- Load -------
+def load_map_asset(source_path, size=None, resampling=RESAMPLING):
+    """
+    The map at source_path as a memory-mapped RGB array of the given (width, height).
+
+    The GeoTIFF is decoded, warped to size (native size if None) with the
+    given resampling and written to CACHE_DIR once; later calls with an
+    unchanged source only map the cached file, without importing rasterio
+    or copying the pixels.
+    """
+    start = time.perf_counter()
+    npy_path, sidecar_path = cache_paths(source_path, size)
+    meta = read_sidecar(sidecar_path)
+    if os.path.exists(npy_path) and is_current(meta, source_path, sidecar_path, resampling):
+        action = "hit"
+    else:
+        meta = build_cache(source_path, size, resampling, npy_path, sidecar_path)
+        action = "built"
+
+    pixels = np.load(npy_path, mmap_mode="r")
+    print(f"Map cache {action}: {os.path.basename(npy_path)} {meta['width']}x{meta['height']} "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return MapAsset(pixels, Affine(*meta["transform"]), meta["src_width"], meta["src_height"])
+
+
+def map_surface(pixels):
+    """A Surface that shares the cached pixels instead of copying them."""
+    height, width = pixels.shape[:2]
+    return pygame.image.frombuffer(pixels, (width, height), "RGB")
@@ -0,0 +1,110 @@
+import os
+import math
+import time
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+from core.georeference.geotiff import copy_geotiff, read_rgb
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PYRAMID_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "pyramids")
+
+TILE_SIZE = 256          # pixels of a cached tile at its own level
+TILE_CACHE_SIZE = 256    # tiles kept, about 48 MB of RGB
+PYRAMID_MIN_SIZE = 4096  # sources up to this size on both sides are read directly even without overviews
+
+
+class ImagePyramid:
+    """
+    A raster read tile by tile at the resolution it is viewed at.
+
+    Level factor f holds every f-th source pixel; factor 1 is full resolution.
+    Reads go through rasterio windows with an out_shape, so GDAL serves them
+    from the matching internal overview. Large sources without overviews are
+    first copied once, strip by strip, into a tiled GeoTIFF with overviews
+    under PYRAMID_DIR (reused while the source is unchanged). Tiles are kept
+    in an LRU cache, so memory is bounded by TILE_CACHE_SIZE whatever the
+    size of the source.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.source = rasterio.open(path)
+        self.width, self.height = self.source.width, self.source.height
+        self.dataset = self.source
+        if not self.source.overviews(1) and max(self.width, self.height) > PYRAMID_MIN_SIZE:
+            self.dataset = rasterio.open(self.overview_copy())
+        self.factors = [1] + self.dataset.overviews(1)
+
+        self.tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def overview_copy(self):
+        stat = os.stat(self.path)
+        key = hashlib.sha1(f"{os.path.abspath(self.path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:12]
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        copy_path = os.path.join(PYRAMID_DIR, f"{stem}_{key}.tif")
+        if not os.path.exists(copy_path):
+            start = time.perf_counter()
+            os.makedirs(PYRAMID_DIR, exist_ok=True)
+            tmp_path = copy_path + ".tmp"
+            copy_geotiff(tmp_path, self.source, self.source.transform, crs=None)
+            os.replace(tmp_path, copy_path)
+            print(f"Pyramid: built {os.path.basename(copy_path)} in {time.perf_counter() - start:.1f} s")
+        return copy_path
+
+    # ------- Levels -------
+    def level(self, scale):
+        """Coarsest level that still has at least one source pixel per screen pixel at this scale."""
+        return max([f for f in self.factors if f * scale <= 1] or [1])
+
+    def tile(self, factor, tx, ty):
+        key = (factor, tx, ty)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+
+        self.misses += 1
+        span = TILE_SIZE * factor
+        col, row = tx * span, ty * span
+        width, height = min(span, self.width - col), min(span, self.height - row)
+        tile = read_rgb(self.dataset, Window(col, row, width, height),
+                        out_shape=(math.ceil(height / factor), math.ceil(width / factor)))
+        self.tiles[key] = tile
+        while len(self.tiles) > TILE_CACHE_SIZE:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def region(self, factor, x0, y0, x1, y1):
+        """
+        Pixels at level factor covering the full-resolution region [x0, x1) x [y0, y1).
+
+        Returns the array and the full-resolution position of its top left
+        pixel; each array pixel spans factor source pixels.
+        """
+        span = TILE_SIZE * factor
+        tx0, ty0 = x0 // span, y0 // span
+        tx1, ty1 = math.ceil(x1 / span), math.ceil(y1 / span)
+
+        rows = []
+        for ty in range(ty0, ty1):
+            rows.append(np.concatenate([self.tile(factor, tx, ty) for tx in range(tx0, tx1)], axis=1))
+        mosaic = np.concatenate(rows, axis=0)
+
+        # Trim the tile-aligned mosaic to the requested region, rounded out to whole level pixels
+        left, top = x0 // factor - tx0 * TILE_SIZE, y0 // factor - ty0 * TILE_SIZE
+        right, bottom = math.ceil(x1 / factor) - tx0 * TILE_SIZE, math.ceil(y1 / factor) - ty0 * TILE_SIZE
+        return mosaic[top:bottom, left:right], ((x0 // factor) * factor, (y0 // factor) * factor)
+
+    def close(self):
+        print(f"Pyramid tiles: {self.hits} hits, {self.misses} reads")
+        if self.dataset is not self.source:
+            self.dataset.close()
+        self.source.close()
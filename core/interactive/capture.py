@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+LATENCY_WINDOW = 120      # results kept for the latency metric
+LATENCY_LOG_INTERVAL = 300
+
+
+class LatestFrameCapture:
+    """
+    Drains a camera on its own thread and keeps only the newest frame.
+
+    cv2.VideoCapture queues frames internally, so a loop that reads one frame
+    after doing slow work keeps processing old ones. Here the device is read
+    continuously and every frame replaces the previous one, together with the
+    time it was captured.
+
+    read() mirrors cv2.VideoCapture.read() and waits for a frame newer than
+    the last one returned; latest() returns immediately.
+    """
+
+    def __init__(self, device=0):
+        self.cap = cv2.VideoCapture(device)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._captured_at = None
+        self._last_read = 0
+        self._running = self.cap.isOpened()
+
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._latency_count = 0
+
+        self._thread = threading.Thread(target=self._run, name="LatestFrameCapture", daemon=True)
+        if self._running:
+            self._thread.start()
+
+    def _run(self):
+        while self._running:
+            ok, frame = self.cap.read()
+            captured_at = time.time()
+            with self._cond:
+                if not ok:
+                    self._running = False
+                else:
+                    self._frame = frame
+                    self._captured_at = captured_at
+                    self._seq += 1
+                self._cond.notify_all()
+
+    def isOpened(self):
+        return self._running
+
+    def read(self, timeout=2.0):
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > self._last_read or not self._running, timeout)
+            if self._seq <= self._last_read:
+                return False, None
+            self._last_read = self._seq
+            return True, self._frame
+
+    def latest(self):
+        """(seq, captured_at, frame) of the newest frame; frame is None until the first one."""
+        with self._cond:
+            return self._seq, self._captured_at, self._frame
+
+    def release(self):
+        self._running = False
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self.cap.release()
+
+    # ------- Latency Metric -------
+    def record_latency(self, captured_at, now=None):
+        """Record capture -> result latency for a frame captured at captured_at."""
+        now = time.time() if now is None else now
+        self.latencies.append(now - captured_at)
+        self._latency_count += 1
+        if self._latency_count % LATENCY_LOG_INTERVAL == 0:
+            avg, p95 = self.latency_stats()
+            print(f"Camera latency (capture -> result): avg {avg * 1000:.0f} ms | p95 {p95 * 1000:.0f} ms")
+
+    def latency_stats(self):
+        if not self.latencies:
+            return 0.0, 0.0
+        values = sorted(self.latencies)
+        return sum(values) / len(values), values[max(0, int(len(values) * 0.95) - 1)]
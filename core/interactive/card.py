@@ -0,0 +1,163 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from PIL import Image
+
+CARD_WIDTH = 240
+CARD_HEIGHT = 220
+CARD_PADDING = 15
+SHADOW_OFFSET = 3
+IMAGE_HEIGHT = 80
+ROW_HEIGHT = 20
+CACHE_SIZE = 32  # prepared cards kept for recently opened ships
+
+SHADOW_COLOR = (60, 60, 60)
+CARD_COLOR = (245, 245, 245)
+TITLE_COLOR = (0, 51, 102)
+LABEL_COLOR = (0, 0, 0)
+VALUE_COLOR = (60, 60, 60)
+PLACEHOLDER_COLOR = (230, 230, 230)
+PLACEHOLDER_TEXT_COLOR = (100, 100, 100)
+
+
+class CardCompositor:
+    """
+    Renders the ship info card into a single surface.
+
+    Fonts are looked up once. A card is composed (shadow, title, photo and
+    text rows) the first time a ShipInfo is shown and kept in a small LRU
+    keyed by that ShipInfo, so every later frame is a single blit and
+    reopening a recent ship costs nothing. New data for a ship produces a
+    new ShipInfo and therefore a fresh card.
+
+    prefetch() reads and decodes the ship photo on a background worker while
+    the selection dwell is running, so only the cheap drawing is left for
+    the frame the dwell completes. The worker never touches pygame: Surfaces
+    and text are made on the render thread. Speculative work is dropped by
+    bumping a generation counter, which the worker checks before decoding.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.title_font = pygame.font.SysFont("Segoe UI", 16, bold=True)
+        self.label_font = pygame.font.SysFont("Segoe UI", 13, bold=True)
+        self.value_font = pygame.font.SysFont("Segoe UI", 13)
+        self.cache_size = cache_size
+        self.cards = OrderedDict()
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="card-prefetch")
+        self.generation = 0
+        self.pending = None  # (info, future)
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+
+    def card(self, info):
+        surface = self.cards.get(info)
+        if surface is not None:
+            self.cards.move_to_end(info)
+            return surface
+
+        photo = None
+        if self.pending is not None and self.pending[0] == info:
+            # Already in flight: waiting is never slower than starting over
+            photo = self.pending[1].result()
+            self.pending = None
+        if photo is not None:
+            self.prefetch_hits += 1
+        else:
+            self.prefetch_misses += 1
+            photo = self.decode_image(info.image_path)
+        surface = self.draw_card(info, *self.photo_surface(photo))
+        self.store(info, surface)
+        return surface
+
+    def store(self, info, surface):
+        self.cards[info] = surface
+        if len(self.cards) > self.cache_size:
+            self.cards.popitem(last=False)
+
+    # ------- Prefetch -------
+    def prefetch(self, info):
+        """Start decoding the photo for a ship the finger is dwelling on."""
+        if info in self.cards or (self.pending is not None and self.pending[0] == info):
+            return
+        self.cancel()
+        self.pending = (info, self.executor.submit(self.decode_image, info.image_path, generation=self.generation))
+
+    def cancel(self):
+        """Drop speculative work, e.g. when the finger moves away before the dwell completes."""
+        if self.pending is None:
+            return
+        self.generation += 1
+        self.pending[1].cancel()
+        self.pending = None
+
+    def close(self):
+        if self.prefetch_hits or self.prefetch_misses:
+            print(f"Card prefetch: {self.prefetch_hits} ready on selection, {self.prefetch_misses} composed on demand")
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------- Composition -------
+    def decode_image(self, img_path, generation=None):
+        """
+        Ship photo as (RGB bytes, size) scaled to the card slot, or (None, placeholder text).
+
+        Only file and PIL work, so it can run on the prefetch worker.
+        """
+        if generation is not None and generation != self.generation:
+            return None
+        size = (CARD_WIDTH - 2 * CARD_PADDING, IMAGE_HEIGHT)
+        if not img_path or not os.path.exists(img_path):
+            return None, "No image"
+        try:
+            with Image.open(img_path) as image:
+                image = image.convert("RGB")
+                if image.size != size:
+                    # Photos stored before thumbnails were generated at ingest
+                    image = image.resize(size, Image.LANCZOS)
+                return image.tobytes(), size
+        except Exception:
+            return None, "Image error"
+
+    def photo_surface(self, photo):
+        """(Surface, None) for decoded pixels, or (None, placeholder text); render thread only."""
+        pixels, detail = photo
+        if pixels is None:
+            return None, detail
+        return pygame.image.frombuffer(pixels, detail, "RGB").convert(), None
+
+    def draw_card(self, info, image, placeholder):
+        img_path, name, dest, eta, nav = info
+        surface = pygame.Surface((CARD_WIDTH + SHADOW_OFFSET, CARD_HEIGHT + SHADOW_OFFSET), pygame.SRCALPHA)
+
+        # Card shadow and background
+        pygame.draw.rect(surface, SHADOW_COLOR, (SHADOW_OFFSET, SHADOW_OFFSET, CARD_WIDTH, CARD_HEIGHT), border_radius=10)
+        pygame.draw.rect(surface, CARD_COLOR, (0, 0, CARD_WIDTH, CARD_HEIGHT), border_radius=10)
+
+        # Ship Name (Title)
+        surface.blit(self.title_font.render(name, True, TITLE_COLOR), (CARD_PADDING, CARD_PADDING))
+
+        # Image (or placeholder)
+        img_y = 40
+        if image is not None:
+            surface.blit(image, (CARD_PADDING, img_y))
+        else:
+            img_width = CARD_WIDTH - 2 * CARD_PADDING
+            pygame.draw.rect(surface, PLACEHOLDER_COLOR, (CARD_PADDING, img_y, img_width, IMAGE_HEIGHT), border_radius=6)
+            surface.blit(self.value_font.render(placeholder, True, PLACEHOLDER_TEXT_COLOR), (CARD_PADDING + 70, img_y + 30))
+
+        # Text rows
+        info_y = img_y + IMAGE_HEIGHT + 10
+        if nav == "Moored":
+            self.draw_row(surface, "Status:", "Moored / Στάσιμο", info_y, 70)
+        else:
+            self.draw_row(surface, "Destination:", dest or "Unknown", info_y, 90)
+            self.draw_row(surface, "ETA:", eta or "Unknown", info_y + ROW_HEIGHT, 45)
+
+        return surface.convert_alpha()
+
+    def draw_row(self, surface, label, value, y, value_offset):
+        surface.blit(self.label_font.render(label, True, LABEL_COLOR), (CARD_PADDING, y))
+        surface.blit(self.value_font.render(value, True, VALUE_COLOR), (CARD_PADDING + value_offset, y))
@@ -2,70 +2,67 @@ import os
 import sys
 import json
 import time
-import ctypes
-from ctypes import wintypes
-from datetime import datetime, timedelta
+import threading
 import pygame
-import rasterio
 import numpy as np
 import cv2
-import mediapipe as mp
+from affine import Affine
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 
-from core.database.db_setup import load_credentials
+from core.georeference.map_cache import load_map_asset, map_surface, RESAMPLING
+from core.interactive.capture import LatestFrameCapture
+from core.interactive.card import CardCompositor
+from core.interactive.fleet import FleetStore
+from core.interactive.flow import FingertipFlow
+from core.interactive.motion import dead_reckon
+from core.interactive.hand_tracking import (
+    HandTracker, index_tip, is_index_touching_thumb, draw_hand, roi_from_polygon,
+    ROI_MARGIN, INFERENCE_WIDTH
+)
+from core.interactive.profiler import FrameProfiler
+from core.interactive.projection import MapProjection
+from core.interactive.renderer import MapRenderer
+from core.interactive.scheduler import InferenceScheduler
+from core.interactive.ship_feed import ShipFeed
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))            # core/interactive/
-CORE_DIR = os.path.dirname(BASE_DIR)                             # core/                    
+CORE_DIR = os.path.dirname(BASE_DIR)                             # core/
 
 COORDINATES_PATH = os.path.join(PROJECT_ROOT,"data", "json", "coordinates.json")
 IMAGE_PATH = os.path.join(PROJECT_ROOT, "data","images", "georeferenced", "georeferenced_map.tif")
-TABLE_NAME = "ships"
 
-# ------- Load Configuration -------
-with open(COORDINATES_PATH, 'r') as f:
-    coordinates = json.load(f)
-
-camera_top_left = coordinates["camera"]["tl_corner"]
-camera_bottom_right = coordinates["camera"]["br_corner"]
-projector_top_left = coordinates["projector"]["tl_corner"]
-projector_bottom_right = coordinates["projector"]["br_corner"]
-
-polygon_points = [
-    camera_top_left,
-    [camera_bottom_right[0], camera_top_left[1]],
-    camera_bottom_right,
-    [camera_top_left[0], camera_bottom_right[1]]
+SHIP_HIT_RADIUS = 20
+INFERENCE_EVERY = 3  # frames between hand inferences while active; optical flow fills the gaps
+DISPLAY_FPS = 60
+
+# Profiler: DISPLAY_PROFILE=1 starts with the overlay on (F3 toggles it),
+# DISPLAY_PROFILE_TRACE=path.jsonl|path.csv writes every profiled frame
+PROFILE_STAGES = [
+    "camera", "tracking", "ships", "interaction", "preview", "render", "flip", "events", "idle",
+    "db_query", "hand_latency",
 ]
-polygon_points_array = np.array(polygon_points, np.int32).reshape((-1, 1, 2))
 
-image_x = projector_top_left[0]
-image_y = projector_top_left[1]
-image_width = projector_bottom_right[0] - projector_top_left[0]
-image_height = projector_bottom_right[1] - projector_top_left[1]
+# ------- Load Configuration -------
+def load_coordinates():
+    with open(COORDINATES_PATH, 'r') as f:
+        return json.load(f)
 
 # ------- Load Georeferenced Image -------
-with rasterio.open(IMAGE_PATH) as src:
-    image_data = src.read()
-    transform = src.transform
-    src_width, src_height = src.width, src.height
-
-if image_data.shape[0] > 3:
-    image_data = image_data[:3]
-elif image_data.shape[0] == 1:
-    image_data = np.repeat(image_data, 3, axis=0)
-
-image_data = np.transpose(image_data, (1, 2, 0))
-image_data = np.clip(image_data, 0, 255).astype(np.uint8)
-image_data = np.flipud(image_data)
-image_data = np.rot90(image_data, 3)
+def load_map_image(size=None, resampling=RESAMPLING):
+    # Warped to the projector rect once (normally by projector calibration); starts map the cached pixels
+    asset = load_map_asset(IMAGE_PATH, size, resampling)
+    return map_surface(asset.pixels), asset.transform, asset.src_width, asset.src_height
 
 # ------- Move Window to Specific Monitor -------
 def move_window_to_monitor(window, monitor_index):
+    import ctypes
+    from ctypes import wintypes
+
     hwnd = pygame.display.get_wm_info()['window']
     user32 = ctypes.windll.user32
 
@@ -87,237 +84,402 @@ def move_window_to_monitor(window, monitor_index):
     left, top, width, height = monitors[monitor_index]
     user32.MoveWindow(hwnd, left, top, width, height, True)
 
-# ------- Setup Display -------
-os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"] = os.environ.get("SDL_VIDEO_FULLSCREEN_DISPLAY", "0")
-pygame.init()
-monitor_index = int(os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"])
-screen_width, screen_height = pygame.display.get_desktop_sizes()[monitor_index]
-screen = pygame.display.set_mode((screen_width, screen_height), pygame.NOFRAME)
-move_window_to_monitor(screen, monitor_index)
-pygame.display.set_caption("Cyclades Interactive")
-
-image_surface = pygame.surfarray.make_surface(image_data)
-image_surface = pygame.transform.scale(image_surface, (image_width, image_height))
-image_rect = image_surface.get_rect(topleft=(image_x, image_y))
-
-cap = cv2.VideoCapture(0)
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
-mp_drawing = mp.solutions.drawing_utils
-
-# ------- Connect to Database -------
-credentials = load_credentials()
-engine = credentials.pop("engine")
-
-if engine == "postgresql":
-    import psycopg2
-    conn = psycopg2.connect(**credentials)
-elif engine == "mysql":
-    import mysql.connector
-    conn = mysql.connector.connect(**credentials)
-else:
-    raise ValueError(f"Unsupported database engine: {engine}")
-
-cursor = conn.cursor()
+# ------- Background Startup -------
+class StartupTask(threading.Thread):
+    """Runs one startup phase on a thread and keeps its result, error and duration."""
+
+    def __init__(self, name, target):
+        super().__init__(name=f"Startup-{name}", daemon=True)
+        self.target = target
+        self.result = None
+        self.error = None
+        self.duration = None
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.result = self.target()
+        except Exception as e:
+            self.error = e
+        self.duration = time.perf_counter() - start
+
+    def get(self):
+        self.join()
+        if self.error is not None:
+            raise self.error
+        return self.result
 
 # ------- Utility Functions -------
-def geo_to_pixel(lat, lon, transform):
-    row, col = rasterio.transform.rowcol(transform, lon, lat)
-    return int(col * image_width / src_width), int(row * image_height / src_height)
-
-def fetch_ship_positions(start_time, end_time):
-    query = f"""
-        SELECT s.mmsi, s.latitude, s.longitude, s.image_path, s.name, s.destination, s.eta, s.navigation_status
-        FROM {TABLE_NAME} s
-        INNER JOIN (
-            SELECT mmsi, MAX(timestamp) AS latest_timestamp
-            FROM {TABLE_NAME}
-            WHERE timestamp BETWEEN %s AND %s
-            GROUP BY mmsi
-        ) latest ON s.mmsi = latest.mmsi AND s.timestamp = latest.latest_timestamp
-        ORDER BY s.timestamp DESC;
+def apply_snapshot(fleet, snapshot, projection, renderer):
+    fleet.update(snapshot.mmsi, snapshot.lat, snapshot.lon, snapshot.speed, snapshot.info,
+                 course=snapshot.course, fix_time=snapshot.fix_time)
+    update_positions(fleet, projection, time.time())
+    print(f"Ship refresh: {fleet.size} ships, query {snapshot.duration * 1000:.0f} ms off-thread "
+          f"vs {renderer.average_frame_time * 1000:.1f} ms frame time")
+
+def update_positions(fleet, projection, now):
+    # Markers only move (and get redrawn) when the extrapolated pixel changes
+    fleet.set_positions(*projection.geo_to_pixel(*dead_reckon(fleet, now)))
+
+# ------- Display Engine -------
+class DisplayEngine:
     """
-    cursor.execute(query, (start_time, end_time))
-    ship_positions = cursor.fetchall()
-    return [
-        (mmsi, geo_to_pixel(lat, lon, transform), image_path, name, destination, eta, nav_status)
-        for mmsi, lat, lon, image_path, name, destination, eta, nav_status in ship_positions
-    ]
-
-def is_near_ship(ship_pos, x, y, threshold=20):
-    ship_x, ship_y = ship_pos
-    return np.hypot(ship_x - x, ship_y - y) <= threshold
-
-def is_index_touching_thumb(hand_landmarks):
-    index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-    thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-    distance = np.sqrt((index_tip.x - thumb_tip.x)**2 + (index_tip.y - thumb_tip.y)**2 + (index_tip.z - thumb_tip.z)**2)
-    return distance < 0.075
-
-def refresh_ship_positions():
-    end_time = datetime.now()
-    start_time = end_time - timedelta(minutes=10)
-    return fetch_ship_positions(start_time, end_time)
-
-# Ship tracking state
-near_ship_start_time = None
-current_ship_mmsi = None
-selected_ship_mmsi = None
-selected_ship_start_time = None
-
-font_main = pygame.font.SysFont("Arial", 24)
-font_small = pygame.font.SysFont("Arial", 18)
-screen_refresh_event = pygame.USEREVENT
-pygame.time.set_timer(screen_refresh_event, 60000)
-
-# ------- Main Application Loop -------
-running = True
-ship_positions = refresh_ship_positions()
-
-while running and cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    frame = cv2.flip(frame, 1)
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(frame_rgb)
-    
-    cv2.polylines(frame, [polygon_points_array], isClosed=True, color=(255, 0, 0), thickness=2)
-
-    # Update ship map
-    map_surface = pygame.surfarray.make_surface(image_data)
-    map_surface = pygame.transform.scale(map_surface, (image_width, image_height))
-
-    for mmsi, (x, y), img_path, name, dest, eta, nav in ship_positions:
-        color = (255, 255, 0) if selected_ship_mmsi == mmsi else (255, 0, 0)
-        pygame.draw.circle(map_surface, color, (x, y), 5)
-
-    # Hand detection and interaction
-    if result.multi_hand_landmarks:
-        for hand_landmarks in result.multi_hand_landmarks:
-            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-            h, w, _ = frame.shape
-            index_x = int(hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP].x * w)
-            index_y = int(hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP].y * h)
-
-            if cv2.pointPolygonTest(polygon_points_array, (index_x, index_y), False) >= 0:
-                cv2.circle(frame, (index_x, index_y), 10, (0, 255, 0), -1)
-
-                norm_x = (index_x - camera_top_left[0]) / (camera_bottom_right[0] - camera_top_left[0])
-                norm_y = (index_y - camera_top_left[1]) / (camera_bottom_right[1] - camera_top_left[1])
-
-                map_x = int((1.0 - norm_x) * image_width)
-                map_y = int(norm_y * image_height)
-                pygame.draw.circle(map_surface, (0, 255, 0), (map_x, map_y), 10)
-
-                for mmsi, (sx, sy), img_path, name, dest, eta, nav in ship_positions:
-                    if is_near_ship((sx, sy), map_x, map_y):
-                        if near_ship_start_time is None:
-                            near_ship_start_time = time.time()
-                            current_ship_mmsi = mmsi
-                        elif current_ship_mmsi == mmsi and time.time() - near_ship_start_time >= 2:
-                            selected_ship_mmsi = mmsi
-                            selected_ship_start_time = time.time()
-                        break
-                else:
-                    near_ship_start_time = None
-                    current_ship_mmsi = None
-
-            if selected_ship_mmsi and is_index_touching_thumb(hand_landmarks):
-                selected_ship_mmsi = None
-                selected_ship_start_time = None
-
-    # Display overlays
-    cv2.imshow("Webcam Feed", frame)
-    screen.fill((0, 0, 0))
-    screen.blit(map_surface, image_rect)
-
-
-
-    if selected_ship_mmsi:
-        for mmsi, _, img_path, name, dest, eta, nav in ship_positions:
-            if mmsi == selected_ship_mmsi:
-                card_x = image_x + image_width - 260
-                card_y = image_y + 20
-                card_width = 240
-                card_height = 220
-                padding = 15
-
-                # Card shadow and background
-                pygame.draw.rect(screen, (60, 60, 60), (card_x + 3, card_y + 3, card_width, card_height), border_radius=10)
-                pygame.draw.rect(screen, (245, 245, 245), (card_x, card_y, card_width, card_height), border_radius=10)
-
-                # Fonts
-                title_font = pygame.font.SysFont("Segoe UI", 16, bold=True)
-                label_font = pygame.font.SysFont("Segoe UI", 13, bold=True)
-                value_font = pygame.font.SysFont("Segoe UI", 13)
-
-                # Ship Name (Title)
-                screen.blit(title_font.render(name, True, (0, 51, 102)), (card_x + padding, card_y + padding))
-
-                # Image (or placeholder)
-                img_y = card_y + 40
-                img_width = card_width - 2 * padding
-                img_height = 80
-                try:
-                    if os.path.exists(img_path):
-                        ship_img = pygame.image.load(img_path)
-                        ship_img = pygame.transform.scale(ship_img, (img_width, img_height))
-                        screen.blit(ship_img, (card_x + padding, img_y))
-                    else:
-                        pygame.draw.rect(screen, (230, 230, 230), (card_x + padding, img_y, img_width, img_height), border_radius=6)
-                        screen.blit(value_font.render("No image", True, (100, 100, 100)), (card_x + padding + 70, img_y + 30))
-                except Exception:
-                    pygame.draw.rect(screen, (230, 230, 230), (card_x + padding, img_y, img_width, img_height), border_radius=6)
-                    screen.blit(value_font.render("Image error", True, (100, 100, 100)), (card_x + padding + 70, img_y + 30))
-
-                # Text rows
-                info_y = img_y + img_height + 10
-                row_height = 20
-
-                if nav == "Moored":
-                    screen.blit(label_font.render("Status:", True, (0, 0, 0)), (card_x + padding, info_y))
-                    screen.blit(value_font.render("Moored / Στάσιμο", True, (60, 60, 60)), (card_x + padding + 70, info_y))
+    The projected map with ships and hand interaction.
+
+    start() brings the display up in phases: config, map asset, window,
+    camera, ship feed. Reading the GeoTIFF, opening the webcam and the
+    first database query only wait on disk, devices or the network, so they
+    run on background threads while the window opens, and the map is
+    projected as soon as it is ready, before the camera delivers its first
+    frame. The hand tracker phase starts its worker process on the first
+    camera frame and is ready when the first result comes back. Every
+    phase's duration is logged.
+
+    Camera, map, ship feed and hand tracker can be passed in, which is how
+    the headless benchmark drives the same loop with synthetic sources.
+    """
+
+    def __init__(self, screen=None, coordinates=None, map_image=None, camera=None, ship_feed=None,
+                 tracker_factory=HandTracker, preview=True, fps=DISPLAY_FPS, profiler=None):
+        self.screen = screen
+        self.coordinates = coordinates
+        self.map_image = map_image
+        self.camera = camera
+        self.ship_feed = ship_feed
+        self.tracker_factory = tracker_factory
+        self.preview = preview
+        self.fps = fps
+        self.profiler = profiler
+
+        self.started_at = None
+        self.phase_times = {}
+        self.camera_task = None
+        self.tracker_started_at = None
+        self.first_ships_logged = False
+
+        self.renderer = None
+        self.cards = None
+        self.projection = None
+        self.fleet = FleetStore()
+        self.clock = pygame.time.Clock()
+
+        self.tracker = None
+        self.scheduler = None
+        self.flow = None
+        self.hands = []
+        self.frame = None
+        self.frame_seq = 0
+
+        # Ship tracking state
+        self.near_ship_start_time = None
+        self.current_ship_mmsi = None
+        self.selected_ship_mmsi = None
+        self.selected_ship_start_time = None
+        self.running = False
+
+    # ------- Startup Phases -------
+    def phase_done(self, name, seconds, background=False):
+        self.phase_times[name] = seconds
+        where = " (background)" if background else ""
+        print(f"Startup: {name} {seconds * 1000:.0f} ms{where}, "
+              f"{time.perf_counter() - self.started_at:.2f} s since start")
+
+    def start(self):
+        self.started_at = time.perf_counter()
+
+        start = time.perf_counter()
+        self.load_config()
+        self.phase_done("config", time.perf_counter() - start)
+
+        # Slow I/O first, on threads, so it overlaps with opening the window
+        map_task = None
+        if self.map_image is None:
+            map_task = StartupTask("map", lambda: load_map_image((self.image_width, self.image_height), self.map_resampling))
+            map_task.start()
+        if self.camera is None:
+            self.camera_task = StartupTask("camera", lambda: LatestFrameCapture(0))
+            self.camera_task.start()
+        if self.ship_feed is None:
+            self.ship_feed = ShipFeed()
+            self.ship_feed.start()
+
+        start = time.perf_counter()
+        if self.screen is None:
+            self.open_window()
+        self.cards = CardCompositor()
+        if self.profiler is None:
+            self.profiler = FrameProfiler(
+                PROFILE_STAGES,
+                enabled=os.environ.get("DISPLAY_PROFILE") == "1",
+                trace_path=os.environ.get("DISPLAY_PROFILE_TRACE"),
+            )
+        self.phase_done("window", time.perf_counter() - start)
+
+        if map_task is not None:
+            self.map_image = map_task.get()
+            self.phase_done("map read", map_task.duration, background=True)
+        start = time.perf_counter()
+        self.load_map()
+        self.renderer.begin_frame()
+        self.renderer.end_frame()
+        self.phase_done("first projected frame", time.perf_counter() - start)
+        self.running = True
+
+    def load_config(self):
+        if self.coordinates is None:
+            self.coordinates = load_coordinates()
+
+        camera_top_left = self.coordinates["camera"]["tl_corner"]
+        camera_bottom_right = self.coordinates["camera"]["br_corner"]
+        projector_top_left = self.coordinates["projector"]["tl_corner"]
+        projector_bottom_right = self.coordinates["projector"]["br_corner"]
+
+        self.camera_top_left = camera_top_left
+        self.camera_bottom_right = camera_bottom_right
+        self.polygon_points = [
+            camera_top_left,
+            [camera_bottom_right[0], camera_top_left[1]],
+            camera_bottom_right,
+            [camera_top_left[0], camera_bottom_right[1]]
+        ]
+        self.polygon_points_array = np.array(self.polygon_points, np.int32).reshape((-1, 1, 2))
+
+        self.image_x = projector_top_left[0]
+        self.image_y = projector_top_left[1]
+        self.image_width = projector_bottom_right[0] - projector_top_left[0]
+        self.image_height = projector_bottom_right[1] - projector_top_left[1]
+
+        # Saved by projector calibration; older calibrations only have the rect
+        geo_to_screen = self.coordinates["projector"].get("geo_to_screen")
+        self.geo_to_screen = Affine(*geo_to_screen) if geo_to_screen else None
+        self.calibrated_map = (self.coordinates["projector"].get("map_transform"),
+                               self.coordinates["projector"].get("map_size"))
+        self.map_resampling = self.coordinates["projector"].get("resampling", RESAMPLING)
+
+        # Optional "tracking" section: {"roi_margin": px, "inference_width": px, "inference_every": frames}
+        tracking = self.coordinates.get("tracking", {})
+        self.roi_margin = tracking.get("roi_margin", ROI_MARGIN)
+        self.inference_width = tracking.get("inference_width", INFERENCE_WIDTH)
+        self.inference_every = tracking.get("inference_every", INFERENCE_EVERY)
+
+    def open_window(self):
+        os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"] = os.environ.get("SDL_VIDEO_FULLSCREEN_DISPLAY", "0")
+        pygame.init()
+        monitor_index = int(os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"])
+        screen_width, screen_height = pygame.display.get_desktop_sizes()[monitor_index]
+        self.screen = pygame.display.set_mode((screen_width, screen_height), pygame.NOFRAME)
+        move_window_to_monitor(self.screen, monitor_index)
+        pygame.display.set_caption("Cyclades Interactive")
+
+    def load_map(self):
+        image_data, transform, src_width, src_height = self.map_image
+        # The stored affine only holds for the map it was calibrated against
+        current_map = (list(transform)[:6], [src_width, src_height])
+        if self.geo_to_screen is not None and self.calibrated_map == current_map:
+            # Markers are drawn relative to the map rect
+            self.projection = MapProjection.from_affine(
+                Affine.translation(-self.image_x, -self.image_y) * self.geo_to_screen)
+        else:
+            if self.geo_to_screen is not None:
+                print("Map changed since projector calibration; projecting from the map's own transform")
+            self.projection = MapProjection(transform, src_width, src_height, self.image_width, self.image_height)
+        self.renderer = MapRenderer(self.screen, image_data,
+                                    (self.image_x, self.image_y, self.image_width, self.image_height))
+
+    def poll_camera(self):
+        """Pick up the camera once its background open has finished; False if it failed."""
+        if self.camera is None:
+            if self.camera_task.is_alive():
+                return True
+            self.camera = self.camera_task.get()
+            self.phase_done("camera", self.camera_task.duration, background=True)
+        return self.camera.isOpened()
+
+    def start_tracker(self, frame):
+        self.tracker_started_at = time.perf_counter()
+        roi = roi_from_polygon(self.polygon_points, frame.shape, self.roi_margin)
+        self.tracker = self.tracker_factory(frame.shape, roi=roi, inference_width=self.inference_width)
+        self.scheduler = InferenceScheduler(roi, active_every=self.inference_every)
+        self.flow = FingertipFlow(frame.shape, roi)
+
+    # ------- Main Loop -------
+    def run(self, max_frames=None):
+        """Render until quit (or max_frames); returns the number of frames rendered."""
+        frames = 0
+        while self.running and self.poll_camera() and (max_frames is None or frames < max_frames):
+            self.step()
+            frames += 1
+        return frames
+
+    def step(self):
+        # Rendering runs at DISPLAY_FPS; camera frames and hand results are picked up when new
+        self.profiler.begin_frame()
+        # Until the webcam has opened, frames are rendered without camera or tracking work
+        new_frame = False
+        if self.camera is not None:
+            seq, captured_at, raw_frame = self.camera.latest()
+            new_frame = seq != self.frame_seq and raw_frame is not None
+        if new_frame:
+            self.frame_seq = seq
+            self.frame = cv2.flip(raw_frame, 1)
+        self.profiler.mark("camera")
+
+        if new_frame:
+            if self.tracker is None:
+                self.start_tracker(self.frame)
+            self.flow.add_frame(captured_at, self.frame)
+            now = time.time()
+            if self.scheduler.should_infer(self.frame, now, len(self.hands) > 0, self.near_ship_start_time is not None):
+                if self.tracker.submit(self.frame, captured_at):
+                    self.scheduler.record_inference(now)
+
+        result = self.tracker.poll() if self.tracker is not None else None
+        if result is not None:
+            if self.tracker_started_at is not None:
+                self.phase_done("hand tracker ready", time.perf_counter() - self.tracker_started_at, background=True)
+                self.tracker_started_at = None
+            self.flow.anchor(result)
+            self.camera.record_latency(result.captured_at)
+            self.scheduler.record_result(result)
+            self.profiler.record("hand_latency", time.time() - result.captured_at)
+        if new_frame or result is not None:
+            self.hands = self.flow.hands()
+        self.profiler.mark("tracking")
+
+        snapshot = self.ship_feed.take()
+        if snapshot is not None:
+            if not self.first_ships_logged:
+                self.phase_done("ship data", time.perf_counter() - self.started_at, background=True)
+                self.first_ships_logged = True
+            apply_snapshot(self.fleet, snapshot, self.projection, self.renderer)
+            self.profiler.record("db_query", snapshot.duration)
+        elif self.fleet.size:
+            update_positions(self.fleet, self.projection, time.time())
+        self.profiler.mark("ships")
+
+        show_preview = self.preview and new_frame
+        if show_preview:
+            cv2.polylines(self.frame, [self.polygon_points_array], isClosed=True, color=(255, 0, 0), thickness=2)
+
+        # Hand detection and interaction
+        cursors = []
+        for hand in self.hands:
+            h, w, _ = self.frame.shape
+            index_x, index_y = index_tip(hand, w, h)
+            if show_preview:
+                draw_hand(self.frame, hand)
+
+            if cv2.pointPolygonTest(self.polygon_points_array, (index_x, index_y), False) >= 0:
+                if show_preview:
+                    cv2.circle(self.frame, (index_x, index_y), 10, (0, 255, 0), -1)
+
+                norm_x = (index_x - self.camera_top_left[0]) / (self.camera_bottom_right[0] - self.camera_top_left[0])
+                norm_y = (index_y - self.camera_top_left[1]) / (self.camera_bottom_right[1] - self.camera_top_left[1])
+
+                map_x = int((1.0 - norm_x) * self.image_width)
+                map_y = int(norm_y * self.image_height)
+                cursors.append((map_x, map_y))
+
+                row = self.fleet.nearest(map_x, map_y, SHIP_HIT_RADIUS)
+                if row is not None:
+                    mmsi = int(self.fleet.mmsi[row])
+                    if self.near_ship_start_time is None:
+                        self.near_ship_start_time = time.time()
+                        self.current_ship_mmsi = mmsi
+                        self.cards.prefetch(self.fleet.info[row])
+                    elif self.current_ship_mmsi == mmsi and time.time() - self.near_ship_start_time >= 2:
+                        self.selected_ship_mmsi = mmsi
+                        self.selected_ship_start_time = time.time()
                 else:
-                    screen.blit(label_font.render("Destination:", True, (0, 0, 0)), (card_x + padding, info_y))
-                    screen.blit(value_font.render(dest or "Unknown", True, (60, 60, 60)), (card_x + padding + 90, info_y))
-
-                    screen.blit(label_font.render("ETA:", True, (0, 0, 0)), (card_x + padding, info_y + row_height))
-                    screen.blit(value_font.render(eta or "Unknown", True, (60, 60, 60)), (card_x + padding + 45, info_y + row_height))
-
-                # Auto-close
-                if time.time() - selected_ship_start_time >= 15:
-                    selected_ship_mmsi = None
-                    selected_ship_start_time = None
-                break
-
-
-
-    pygame.display.flip()
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-            running = False
-        elif event.type == screen_refresh_event:
-            ship_positions = refresh_ship_positions()
-
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        running = False
-
-# Show Closing Message
-screen.fill((0, 0, 0))
-closing_font = pygame.font.SysFont("Arial", 48, bold=True)
-text_surface = closing_font.render("App is Closing .....", True, (255, 255, 255))
-text_rect = text_surface.get_rect(center=(screen_width // 2, screen_height // 2))
-screen.blit(text_surface, text_rect)
-pygame.display.flip()
-time.sleep(2)
-
-# Shutdown 
-cap.release()
-pygame.quit()
-cv2.destroyAllWindows()
-cursor.close()
-conn.close()
-sys.exit(0)
+                    self.near_ship_start_time = None
+                    self.current_ship_mmsi = None
+                    self.cards.cancel()
+
+            if self.selected_ship_mmsi and is_index_touching_thumb(hand):
+                self.selected_ship_mmsi = None
+                self.selected_ship_start_time = None
+
+        self.profiler.mark("interaction")
+
+        # Display overlays
+        if show_preview:
+            cv2.imshow("Webcam Feed", self.frame)
+        self.profiler.mark("preview")
+
+        self.fleet.select(self.selected_ship_mmsi)
+        self.fleet.mark_stale(self.ship_feed.is_stale())
+        self.renderer.begin_frame()
+        self.renderer.draw_markers(self.fleet)
+        for map_x, map_y in cursors:
+            self.renderer.draw_cursor(map_x, map_y)
+        if self.ship_feed.is_stale():
+            self.renderer.draw_status(self.ship_feed.status_text())
+
+        selected_row = self.fleet.row_of(self.selected_ship_mmsi) if self.selected_ship_mmsi else None
+        if selected_row is not None:
+            card_position = (self.image_x + self.image_width - 260, self.image_y + 20)
+            self.renderer.blit_overlay(self.cards.card(self.fleet.info[selected_row]), card_position)
+
+            # Auto-close
+            if time.time() - self.selected_ship_start_time >= 15:
+                self.selected_ship_mmsi = None
+                self.selected_ship_start_time = None
+
+        self.profiler.draw(self.renderer)
+        self.profiler.mark("render")
+        self.renderer.end_frame()
+        self.profiler.mark("flip")
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
+
+        if self.preview and cv2.waitKey(1) & 0xFF == ord('q'):
+            self.running = False
+        self.profiler.mark("events")
+        self.clock.tick(self.fps)
+        self.profiler.mark("idle")
+
+    # ------- Shutdown -------
+    def show_closing_message(self):
+        screen_width, screen_height = self.screen.get_size()
+        self.screen.fill((0, 0, 0))
+        closing_font = pygame.font.SysFont("Arial", 48, bold=True)
+        text_surface = closing_font.render("App is Closing .....", True, (255, 255, 255))
+        text_rect = text_surface.get_rect(center=(screen_width // 2, screen_height // 2))
+        self.screen.blit(text_surface, text_rect)
+        pygame.display.flip()
+        time.sleep(2)
+
+    def shutdown(self):
+        if self.camera is None and self.camera_task is not None:
+            self.camera = self.camera_task.get()
+        if self.camera is not None:
+            self.camera.release()
+        if self.tracker is not None:
+            self.tracker.close()
+        if self.cards is not None:
+            self.cards.close()
+        if self.profiler is not None:
+            self.profiler.close()
+        if self.ship_feed is not None:
+            self.ship_feed.stop()
+
+# ------- Main Application -------
+def main():
+    engine = DisplayEngine()
+    engine.start()
+    engine.run()
+    engine.show_closing_message()
+
+    # Shutdown
+    engine.shutdown()
+    pygame.quit()
+    cv2.destroyAllWindows()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+from collections import namedtuple
+
+import numpy as np
+
+from core.interactive.spatial import GridIndex
+
+# ------- Ship Flags -------
+FLAG_SELECTED = 1
+FLAG_MOORED = 2
+FLAG_STALE = 4
+
+# Per-ship strings live in a side table next to the numeric columns
+ShipInfo = namedtuple("ShipInfo", "image_path name destination eta navigation_status")
+
+COLUMNS = {
+    "mmsi": np.int64,
+    "x": np.int32,
+    "y": np.int32,
+    "lat": np.float64,
+    "lon": np.float64,
+    "speed": np.float32,
+    "course": np.float32,    # degrees over ground, NaN when unknown
+    "fix_time": np.float64,  # epoch seconds of the AIS report, NaN when unknown
+    "flags": np.uint8,
+}
+
+GRID_CELL_SIZE = 32  # pixels
+
+
+class FleetStore:
+    """
+    Columnar store of the ships currently shown on the map.
+
+    Rows 0..size-1 are live. Each column is a NumPy array that only grows
+    (by doubling) when the fleet outgrows it, so refreshes update rows in place.
+    """
+
+    def __init__(self, capacity=256):
+        self.size = 0
+        self.version = 0
+        self.positions_version = 0
+        self.index = {}
+        self.grid = GridIndex(GRID_CELL_SIZE)
+        self.grid_version = -1
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+        self.info = [None] * capacity
+
+    @property
+    def capacity(self):
+        return len(self.mmsi)
+
+    def reserve(self, capacity):
+        if capacity <= self.capacity:
+            return
+        new_capacity = max(capacity, self.capacity * 2)
+        for name, dtype in COLUMNS.items():
+            column = np.zeros(new_capacity, dtype)
+            column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+        self.info.extend([None] * (new_capacity - len(self.info)))
+
+    def column(self, name):
+        return getattr(self, name)[:self.size]
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    # ------- Updates -------
+    def update(self, mmsi, lat, lon, speed, info, course=None, fix_time=None):
+        """
+        Replace the fleet with the given ships.
+
+        Ships already present keep their row, new ones are appended and ships
+        missing from the update are removed by moving the last row into the gap.
+        """
+        mmsi = np.asarray(mmsi, dtype=np.int64)
+        incoming = set(mmsi.tolist())
+        for gone in [m for m in self.index if m not in incoming]:
+            self.remove(gone)
+
+        self.reserve(len(incoming))  # after the removals every stored ship is one of these
+        rows = np.empty(len(mmsi), dtype=np.intp)
+        for i, m in enumerate(mmsi.tolist()):
+            row = self.index.get(m)
+            if row is None:
+                row = self.size
+                self.index[m] = row
+                self.flags[row] = 0
+                self.size += 1
+            rows[i] = row
+            self.info[row] = ShipInfo(*info[i])
+
+        self.mmsi[rows] = mmsi
+        self.lat[rows] = np.asarray(lat, dtype=np.float64)
+        self.lon[rows] = np.asarray(lon, dtype=np.float64)
+        self.speed[rows] = np.nan_to_num(np.asarray(speed, dtype=np.float32))
+        self.course[rows] = np.nan if course is None else np.asarray(course, dtype=np.float32)
+        self.fix_time[rows] = np.nan if fix_time is None else np.asarray(fix_time, dtype=np.float64)
+
+        moored = np.array([self.info[row].navigation_status == "Moored" for row in rows.tolist()], dtype=bool)
+        self.flags[rows] = np.where(moored, self.flags[rows] | FLAG_MOORED, self.flags[rows] & ~np.uint8(FLAG_MOORED))
+        self.version += 1
+        self.positions_version += 1
+
+    def remove(self, mmsi):
+        row = self.index.pop(mmsi, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            for name in COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            self.info[row] = self.info[last]
+            self.index[int(self.mmsi[row])] = row
+        self.info[last] = None
+        self.size = last
+        self.version += 1
+        self.positions_version += 1
+
+    def set_positions(self, x, y):
+        if np.array_equal(self.column("x"), x) and np.array_equal(self.column("y"), y):
+            return
+        self.x[:self.size] = x
+        self.y[:self.size] = y
+        self.version += 1
+        self.positions_version += 1
+
+    def mark_stale(self, stale):
+        """Flag every ship as stale (or fresh) while the ship feed is out of date."""
+        flags = self.column("flags")
+        changed = ((flags & FLAG_STALE) != 0) != stale
+        if not changed.any():
+            return
+        if stale:
+            flags |= FLAG_STALE
+        else:
+            flags &= ~np.uint8(FLAG_STALE)
+        self.version += 1
+
+    # ------- Queries -------
+    def row_of(self, mmsi):
+        return self.index.get(mmsi)
+
+    def select(self, mmsi):
+        flags = self.column("flags")
+        row = self.index.get(mmsi)
+        selected = np.flatnonzero(flags & FLAG_SELECTED)
+        if selected.tolist() == ([] if row is None else [row]):
+            return
+        flags &= ~np.uint8(FLAG_SELECTED)
+        if row is not None:
+            flags[row] |= FLAG_SELECTED
+        self.version += 1
+
+    def spatial_index(self):
+        # Rebuilt lazily, only after positions or rows changed
+        if self.grid_version != self.positions_version:
+            self.grid.build(self.column("x"), self.column("y"))
+            self.grid_version = self.positions_version
+        return self.grid
+
+    def nearest(self, x, y, radius):
+        """Row of the ship closest to (x, y) within radius pixels, or None."""
+        return self.spatial_index().nearest(x, y, radius)
+
+    def within(self, x, y, radius):
+        """Rows of all ships within radius pixels of (x, y)."""
+        return self.spatial_index().within(x, y, radius)
@@ -0,0 +1,93 @@
+from collections import deque
+
+import numpy as np
+import cv2
+
+from core.interactive.hand_tracking import INDEX_FINGER_TIP, THUMB_TIP
+
+HISTORY = 8  # recent frames kept to re-anchor late inference results
+TRACKED = [INDEX_FINGER_TIP, THUMB_TIP]
+LK_PARAMS = dict(
+    winSize=(21, 21),
+    maxLevel=3,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03),
+)
+
+
+class FingertipFlow:
+    """
+    Carries the index and thumb tips forward between hand inferences.
+
+    Every camera frame the tracked points are propagated with sparse
+    pyramidal Lucas-Kanade flow over the grayscale ROI. When an inference
+    result arrives it is re-anchored on the frame it was computed from and
+    flowed straight to the newest frame, which also hides the inference
+    delay. The rest of the skeleton follows the mean tip displacement.
+    """
+
+    def __init__(self, frame_shape, roi=None):
+        self.height, self.width = frame_shape[:2]
+        self.roi = roi if roi is not None else (0, 0, self.width, self.height)
+        self.history = deque(maxlen=HISTORY)  # (captured_at, gray)
+        self.landmarks = np.zeros((0, 21, 3), dtype=np.float32)
+        self.anchor_points = None
+        self.points = None  # (n_hands, 2, 2) ROI pixels in the newest frame
+
+    def gray(self, frame):
+        x0, y0, x1, y1 = self.roi
+        return cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+
+    def add_frame(self, captured_at, frame):
+        gray = self.gray(frame)
+        if self.points is not None and self.history:
+            self.points = self.track(self.history[-1][1], gray, self.points)
+        self.history.append((captured_at, gray))
+
+    def anchor(self, result):
+        self.landmarks = result.hands
+        if not len(result.hands):
+            self.points = self.anchor_points = None
+            return
+
+        self.anchor_points = self.to_pixels(result.hands[:, TRACKED, :2])
+        source = next((gray for captured_at, gray in self.history if captured_at == result.captured_at), None)
+        if source is None or source is self.history[-1][1]:
+            self.points = self.anchor_points
+        else:
+            self.points = self.track(source, self.history[-1][1], self.anchor_points)
+
+    def track(self, prev_gray, next_gray, points):
+        flat = points.reshape(-1, 1, 2).astype(np.float32)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, next_gray, flat, None, **LK_PARAMS)
+        if moved is None:
+            return points
+        found = status.reshape(-1).astype(bool)
+        moved = moved.reshape(-1, 2)
+        flat = flat.reshape(-1, 2)
+        flat[found] = moved[found]
+        return flat.reshape(points.shape)
+
+    def hands(self):
+        """Latest landmarks with the tips moved to their flowed positions."""
+        if self.points is None:
+            return self.landmarks
+        hands = self.landmarks.copy()
+        shift = self.to_normalized(self.points) - self.to_normalized(self.anchor_points)
+        hands[..., :2] += shift.mean(axis=1, keepdims=True)
+        hands[:, TRACKED, :2] = self.to_normalized(self.points)
+        return hands
+
+    # ------- Coordinates -------
+    def to_pixels(self, normalized):
+        x0, y0 = self.roi[:2]
+        pixels = np.empty(normalized.shape, dtype=np.float32)
+        pixels[..., 0] = normalized[..., 0] * self.width - x0
+        pixels[..., 1] = normalized[..., 1] * self.height - y0
+        return pixels
+
+    def to_normalized(self, pixels):
+        x0, y0 = self.roi[:2]
+        normalized = np.empty(pixels.shape, dtype=np.float32)
+        normalized[..., 0] = (pixels[..., 0] + x0) / self.width
+        normalized[..., 1] = (pixels[..., 1] + y0) / self.height
+        return normalized
@@ -0,0 +1,216 @@
+import time
+import multiprocessing
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+import cv2
+
+RING_SLOTS = 4
+PINCH_DISTANCE = 0.075
+ROI_MARGIN = 120          # pixels around the interaction area, so the palm stays in view
+INFERENCE_WIDTH = None    # downscale the crop to this width before inference; None keeps it
+
+# Landmark indices and skeleton, matching mediapipe.solutions.hands
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+# hands: float32 array (n_hands, 21, 3) of normalized landmarks
+# cpu_time: the worker's cumulative process CPU time when the result was sent
+HandResult = namedtuple("HandResult", "seq captured_at processed_at hands cpu_time")
+
+
+# ------- Landmark Helpers -------
+def index_tip(hand, width, height):
+    return int(hand[INDEX_FINGER_TIP, 0] * width), int(hand[INDEX_FINGER_TIP, 1] * height)
+
+
+def is_index_touching_thumb(hand):
+    return np.linalg.norm(hand[INDEX_FINGER_TIP] - hand[THUMB_TIP]) < PINCH_DISTANCE
+
+
+def draw_hand(frame, hand):
+    h, w = frame.shape[:2]
+    points = [(int(x * w), int(y * h)) for x, y, _ in hand.tolist()]
+    for a, b in HAND_CONNECTIONS:
+        cv2.line(frame, points[a], points[b], (255, 255, 255), 2)
+    for point in points:
+        cv2.circle(frame, point, 3, (0, 0, 255), -1)
+
+
+# ------- Region of Interest -------
+def roi_from_polygon(polygon_points, frame_shape, margin=ROI_MARGIN):
+    """Bounding box (x0, y0, x1, y1) of the interaction polygon plus margin, clipped to the frame."""
+    points = np.asarray(polygon_points).reshape(-1, 2)
+    h, w = frame_shape[:2]
+    x0, y0 = points.min(axis=0) - margin
+    x1, y1 = points.max(axis=0) + margin
+    return max(0, int(x0)), max(0, int(y0)), min(w, int(x1)), min(h, int(y1))
+
+
+def prepare_inference_frame(frame, roi=None, inference_width=None):
+    """Crop a BGR frame to the ROI, downscale it and convert it to RGB for mediapipe."""
+    if roi is not None:
+        x0, y0, x1, y1 = roi
+        frame = frame[y0:y1, x0:x1]
+    if inference_width and frame.shape[1] > inference_width:
+        height = max(1, round(frame.shape[0] * inference_width / frame.shape[1]))
+        frame = cv2.resize(frame, (inference_width, height), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def landmarks_to_frame(landmarks, roi, frame_shape):
+    """Map landmarks normalized to the ROI crop back to full-frame normalized coordinates."""
+    if roi is None:
+        return landmarks
+    h, w = frame_shape[:2]
+    x0, y0, x1, y1 = roi
+    crop_w, crop_h = x1 - x0, y1 - y0
+    mapped = landmarks.copy()
+    mapped[..., 0] = (x0 + landmarks[..., 0] * crop_w) / w
+    mapped[..., 1] = (y0 + landmarks[..., 1] * crop_h) / h
+    # mediapipe scales z like x, so it follows the crop width
+    mapped[..., 2] = landmarks[..., 2] * crop_w / w
+    return mapped
+
+
+def detect_hands(hands, frame, roi=None, inference_width=None):
+    """Run a mediapipe Hands instance on one frame; returns (n_hands, 21, 3) full-frame landmarks."""
+    result = hands.process(prepare_inference_frame(frame, roi, inference_width))
+    if not result.multi_hand_landmarks:
+        return np.zeros((0, 21, 3), dtype=np.float32)
+    detected = np.array([
+        [(lm.x, lm.y, lm.z) for lm in hand.landmark]
+        for hand in result.multi_hand_landmarks
+    ], dtype=np.float32)
+    return landmarks_to_frame(detected, roi, frame.shape)
+
+
+# ------- Shared Frame Ring -------
+class FrameRing:
+    """Fixed number of frame slots in a shared memory block."""
+
+    def __init__(self, shape, slots, name=None):
+        nbytes = int(np.prod(shape)) * slots
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self, unlink=False):
+        del self.frames
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# ------- Worker Process -------
+def _tracking_worker(ring_name, shape, slots, requests, results, options, roi, inference_width):
+    import mediapipe as mp
+
+    ring = FrameRing(shape, slots, name=ring_name)
+    hands = mp.solutions.hands.Hands(**options)
+    try:
+        while True:
+            request = requests.recv()
+            # Skip to the newest frame; older ones are already out of date
+            while request is not None and requests.poll():
+                request = requests.recv()
+            if request is None:
+                break
+
+            seq, captured_at = request
+            detected = detect_hands(hands, ring.frames[seq % slots], roi, inference_width)
+            results.send(HandResult(seq, captured_at, time.time(), detected, time.process_time()))
+    finally:
+        hands.close()
+        ring.close()
+
+
+class HandTracker:
+    """
+    Runs mediapipe hand tracking in a separate process.
+
+    Camera frames are copied into a shared-memory ring buffer and only the
+    slot index travels over the pipe; landmarks come back as small
+    HandResult messages tagged with the frame's capture time. submit() and
+    poll() never block, so rendering is not held back by inference speed.
+
+    With an roi the worker only looks at that part of the frame, optionally
+    downscaled to inference_width; landmarks are still reported in
+    full-frame coordinates.
+    """
+
+    def __init__(self, frame_shape, roi=None, inference_width=INFERENCE_WIDTH, slots=RING_SLOTS,
+                 min_detection_confidence=0.7, min_tracking_confidence=0.7):
+        ctx = multiprocessing.get_context("spawn")
+        self.ring = FrameRing(frame_shape, slots)
+        self.requests, worker_requests = ctx.Pipe()
+        worker_results, self.results = ctx.Pipe()
+        options = {
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence,
+        }
+        self.process = ctx.Process(
+            target=_tracking_worker,
+            args=(self.ring.name, self.ring.shape, slots, worker_requests, worker_results, options,
+                  roi, inference_width),
+            name="HandTracker",
+            daemon=True,
+        )
+        self.process.start()
+
+        self.alive = True
+        self.next_seq = 0
+        self.done_seq = -1
+
+    def busy(self):
+        # A slot may only be rewritten once the worker has moved past it
+        return self.next_seq - self.done_seq >= self.ring.slots
+
+    def submit(self, frame, captured_at):
+        """Queue a frame for inference; returns False if the ring is full."""
+        if not self.alive or frame.shape != self.ring.shape or self.busy():
+            return False
+        seq = self.next_seq
+        self.ring.frames[seq % self.ring.slots] = frame
+        self.requests.send((seq, captured_at))
+        self.next_seq += 1
+        return True
+
+    def poll(self):
+        """Newest result received since the last call, or None."""
+        latest = None
+        try:
+            while self.results.poll():
+                latest = self.results.recv()
+                self.done_seq = latest.seq
+        except (EOFError, OSError):
+            if self.process.exitcode is not None and self.alive:
+                print(f"Hand tracking process stopped (exit code {self.process.exitcode})")
+            self.alive = False
+        return latest
+
+    def close(self):
+        try:
+            self.requests.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close(unlink=True)
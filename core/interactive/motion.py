@@ -0,0 +1,38 @@
+import numpy as np
+
+from core.interactive.fleet import FLAG_MOORED
+
+MAX_EXTRAPOLATION = 180.0   # seconds; fixes older than this are advanced this far, then held there
+MIN_SPEED = 0.5             # knots; slower reports are treated as GPS jitter
+SPEED_UNAVAILABLE = 102.3   # AIS "speed not available"
+COURSE_UNAVAILABLE = 360.0  # AIS "course not available"
+
+KNOT = 1852.0 / 3600.0           # metres per second
+METERS_PER_DEGREE = 1852.0 * 60  # one minute of latitude is one nautical mile
+
+
+def dead_reckon(fleet, now, max_age=MAX_EXTRAPOLATION):
+    """
+    Estimated (lat, lon) of every ship at time now.
+
+    Each position is advanced from its last fix along the reported course at
+    the reported speed, for at most max_age seconds. Moored ships and ships
+    without a usable speed, course or fix time keep their reported position.
+    """
+    lat = fleet.column("lat")
+    lon = fleet.column("lon")
+    speed = fleet.column("speed").astype(np.float64)
+    course = fleet.column("course").astype(np.float64)
+
+    age = np.clip(now - fleet.column("fix_time"), 0.0, max_age)
+    moving = (
+        np.isfinite(age) & np.isfinite(course)
+        & (speed >= MIN_SPEED) & (speed < SPEED_UNAVAILABLE) & (course < COURSE_UNAVAILABLE)
+        & ((fleet.column("flags") & FLAG_MOORED) == 0)
+    )
+    distance = np.where(moving, speed * KNOT * np.nan_to_num(age), 0.0)
+
+    heading = np.radians(np.nan_to_num(course))
+    dlat = distance * np.cos(heading) / METERS_PER_DEGREE
+    dlon = distance * np.sin(heading) / (METERS_PER_DEGREE * np.cos(np.radians(lat)))
+    return lat + dlat, lon + dlon
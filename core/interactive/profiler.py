@@ -0,0 +1,144 @@
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+WINDOW = 300             # frames kept for the rolling percentiles
+OVERLAY_REFRESH = 0.5    # seconds between overlay redraws
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+
+
+class FrameProfiler:
+    """
+    Per-stage timing of the display loop.
+
+    begin_frame() starts a frame and mark(stage) closes the stage that ran
+    since the previous mark, so stages are timed back to back without
+    nesting. record(name, seconds) adds values measured elsewhere, such as
+    the off-thread database query. The last WINDOW frames feed the p50/p95
+    overlay, and every frame can be appended to a .jsonl or .csv trace
+    (values in milliseconds).
+
+    While disabled each call returns after a single attribute check.
+    """
+
+    def __init__(self, stages, enabled=False, trace_path=None, window=WINDOW):
+        self.stages = list(stages)
+        self.enabled = enabled
+        self.samples = {name: deque(maxlen=window) for name in ["frame"] + self.stages}
+        self.current = {}
+        self.frame_start = None
+        self.last_mark = None
+        self.frame_count = 0
+
+        self.font = None
+        self.overlay = None
+        self.overlay_time = 0.0
+
+        self.trace_file = None
+        self.trace_writer = None
+        if trace_path:
+            self.open_trace(trace_path)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = self.last_mark = None
+        self.current = {}
+        print(f"Profiler {'on' if self.enabled else 'off'}")
+
+    # ------- Timing -------
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.current["frame"] = now - self.frame_start
+            self.finish_frame()
+        self.frame_start = self.last_mark = now
+        self.current = {}
+
+    def mark(self, stage):
+        if not self.enabled or self.last_mark is None:
+            return
+        now = time.perf_counter()
+        self.current[stage] = self.current.get(stage, 0.0) + now - self.last_mark
+        self.last_mark = now
+
+    def record(self, name, seconds):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.current[name] = seconds
+
+    def finish_frame(self):
+        self.frame_count += 1
+        for name, seconds in self.current.items():
+            if name in self.samples:
+                self.samples[name].append(seconds)
+        if self.trace_writer is not None:
+            self.trace_writer(self.current)
+
+    def percentiles(self, name):
+        samples = self.samples[name]
+        if not samples:
+            return None
+        return np.percentile(np.fromiter(samples, dtype=np.float64), [50, 95])
+
+    # ------- Overlay -------
+    def draw(self, renderer):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time >= OVERLAY_REFRESH:
+            self.overlay = self.render_overlay()
+            self.overlay_time = now
+        renderer.blit_overlay(self.overlay, (renderer.rect.left + 10, renderer.rect.top + 10))
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont("Consolas", 14)
+
+        frame = self.percentiles("frame")
+        fps = 1.0 / np.mean(self.samples["frame"]) if frame is not None else 0.0
+        lines = [f"FPS {fps:5.1f}   p50/p95 ms"]
+        if frame is not None:
+            lines.append(f"{'frame':<12}{frame[0] * 1000:7.2f}{frame[1] * 1000:8.2f}")
+        for name in self.stages:
+            values = self.percentiles(name)
+            if values is not None:
+                lines.append(f"{name:<12}{values[0] * 1000:7.2f}{values[1] * 1000:8.2f}")
+
+        labels = [self.font.render(line, True, OVERLAY_COLOR) for line in lines]
+        line_height = self.font.get_linesize()
+        width = max(label.get_width() for label in labels) + 16
+        surface = pygame.Surface((width, line_height * len(labels) + 12), pygame.SRCALPHA)
+        surface.fill(OVERLAY_BACKGROUND)
+        for i, label in enumerate(labels):
+            surface.blit(label, (8, 6 + i * line_height))
+        return surface
+
+    # ------- Trace -------
+    def open_trace(self, path):
+        self.trace_file = open(path, "w", newline="")
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(self.trace_file, ["frame_index", "time", "frame"] + self.stages, restval="", extrasaction="ignore")
+            writer.writeheader()
+            self.trace_writer = lambda row: writer.writerow(self.trace_row(row))
+        else:
+            self.trace_writer = lambda row: self.trace_file.write(json.dumps(self.trace_row(row)) + "\n")
+        print(f"Profiler trace: {path}")
+
+    def trace_row(self, row):
+        row = {name: round(seconds * 1000, 3) for name, seconds in row.items()}
+        row["frame_index"] = self.frame_count
+        row["time"] = round(time.time(), 3)
+        return row
+
+    def close(self):
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+            self.trace_writer = None
@@ -0,0 +1,40 @@
+import numpy as np
+from affine import Affine
+
+
+class MapProjection:
+    """
+    Maps geographic coordinates to pixels of the map as drawn by the projector.
+
+    The raster's geo transform and the rescale from source pixels to the
+    projector rect are folded into one affine, so whole coordinate arrays
+    are projected with a single vectorized operation.
+    """
+
+    def __init__(self, transform, src_width, src_height, width, height):
+        self.geo_to_screen = Affine.scale(width / src_width, height / src_height) * ~transform
+        self.screen_to_geo = ~self.geo_to_screen
+
+    @classmethod
+    def from_affine(cls, geo_to_screen):
+        """A projection from an already composed geo -> map pixel affine, e.g. one saved by calibration."""
+        projection = cls.__new__(cls)
+        projection.geo_to_screen = geo_to_screen
+        projection.screen_to_geo = ~geo_to_screen
+        return projection
+
+    def geo_to_pixel(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        a, b, c, d, e, f = self.geo_to_screen[:6]
+        x = a * lon + b * lat + c
+        y = d * lon + e * lat + f
+        return np.floor(x).astype(np.int32), np.floor(y).astype(np.int32)
+
+    def pixel_to_geo(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        a, b, c, d, e, f = self.screen_to_geo[:6]
+        lon = a * x + b * y + c
+        lat = d * x + e * y + f
+        return lat, lon
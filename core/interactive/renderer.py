@@ -0,0 +1,228 @@
+import time
+import numpy as np
+import pygame
+
+from core.interactive.fleet import FLAG_SELECTED, FLAG_MOORED, FLAG_STALE
+
+MARKER_RADIUS = 5
+MARKER_COLOR = (255, 0, 0)
+SELECTED_COLOR = (255, 255, 0)
+STALE_COLOR = (140, 140, 140)
+MOORED_COLOR = (170, 0, 0)
+SPRITE_KEY = (255, 0, 255)
+
+# ------- Marker States -------
+NORMAL, SELECTED, STALE, MOORED = range(4)
+STATE_COLORS = [MARKER_COLOR, SELECTED_COLOR, STALE_COLOR, MOORED_COLOR]
+CURSOR_RADIUS = 10
+CURSOR_COLOR = (0, 255, 0)
+BACKGROUND_COLOR = (0, 0, 0)
+
+FULL_REFRESH_INTERVAL = 5.0  # seconds, safety net for anything the dirty rects missed
+MAX_MARKER_RECTS = 300       # above this many moved markers a full refresh is cheaper
+STATUS_COLOR = (255, 255, 255)
+STATUS_BACKGROUND = (150, 0, 0)
+
+
+def marker_sprite(color):
+    # Same pixels as pygame.draw.circle(screen, color, (x, y), MARKER_RADIUS) blitted at (x - r, y - r)
+    size = 2 * MARKER_RADIUS
+    sprite = pygame.Surface((size, size))
+    sprite.fill(SPRITE_KEY)
+    pygame.draw.circle(sprite, color, (MARKER_RADIUS, MARKER_RADIUS), MARKER_RADIUS)
+    sprite.set_colorkey(SPRITE_KEY)
+    return sprite.convert()
+
+
+def marker_states(flags):
+    """Sprite index per ship; selection wins over staleness, staleness over moored."""
+    states = np.full(len(flags), NORMAL, dtype=np.intp)
+    states[(flags & FLAG_MOORED) != 0] = MOORED
+    states[(flags & FLAG_STALE) != 0] = STALE
+    states[(flags & FLAG_SELECTED) != 0] = SELECTED
+    return states
+
+
+class MapRenderer:
+    """
+    Draws the projected map in layers.
+
+    The georeferenced raster never changes, so it is scaled to the projector
+    rect and converted to the display pixel format once. Each frame only
+    composites ship markers, fingertip cursors and the info card on top of it.
+
+    Only regions that changed are pushed to the display: overlays drawn in the
+    previous frame are restored from the cached base map, markers under them
+    are redrawn, and the union of old and new rects goes to display.update().
+    A full refresh runs every FULL_REFRESH_INTERVAL seconds regardless.
+
+    Markers are pre-rendered once per state and submitted with a single
+    Surface.blits() call built from the fleet arrays.
+    """
+
+    def __init__(self, screen, image_data, rect):
+        self.screen = screen
+        self.rect = pygame.Rect(rect)
+
+        # image_data is a Surface (e.g. from the map cache) or an array in surfarray layout
+        if isinstance(image_data, pygame.Surface):
+            base = image_data
+        else:
+            base = pygame.surfarray.make_surface(image_data)
+        if base.get_size() != self.rect.size:
+            base = pygame.transform.scale(base, self.rect.size)
+        self.base = base.convert()
+        self.sprites = [marker_sprite(color) for color in STATE_COLORS]
+
+        self.full_refresh = True
+        self.last_full_refresh = 0.0
+        self.marker_version = None
+        self.marker_state = (np.zeros(0, np.int32), np.zeros(0, np.int32), np.zeros(0, np.uint8))
+        self.previous_overlays = []
+        self.overlays = []
+        self.dirty = []
+
+        self.status_font = pygame.font.SysFont("Arial", 18)
+        self.status_surfaces = {}
+
+        self.frame_start = None
+        self.average_frame_time = 0.0
+
+    def invalidate(self):
+        self.full_refresh = True
+
+    # ------- Layers -------
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.overlays = []
+        self.dirty = []
+
+        if self.frame_start - self.last_full_refresh >= FULL_REFRESH_INTERVAL:
+            self.full_refresh = True
+
+        if self.full_refresh:
+            self.screen.fill(BACKGROUND_COLOR)
+            self.screen.blit(self.base, self.rect)
+            self.marker_version = None
+        else:
+            for rect in self.previous_overlays:
+                self.restore(rect)
+
+    def draw_markers(self, fleet):
+        xs, ys = fleet.column("x"), fleet.column("y")
+        flags = fleet.column("flags")
+
+        if self.full_refresh:
+            visible = slice(None)
+        elif fleet.version != self.marker_version:
+            old_xs, old_ys, old_flags = self.marker_state
+            if len(old_xs) == len(xs):
+                # Same rows: only markers that moved or changed state need repainting
+                changed = (old_xs != xs) | (old_ys != ys) | (old_flags != flags)
+                old_xs, old_ys = old_xs[changed], old_ys[changed]
+            else:
+                changed = np.ones(len(xs), dtype=bool)
+
+            if len(old_xs) + np.count_nonzero(changed) > MAX_MARKER_RECTS:
+                self.full_refresh = True
+                self.screen.fill(BACKGROUND_COLOR)
+                self.screen.blit(self.base, self.rect)
+                visible = slice(None)
+            else:
+                restored = self.restore_markers(old_xs, old_ys)
+                self.dirty.extend(self.marker_rect(x, y) for x, y in zip(xs[changed].tolist(), ys[changed].tolist()))
+                visible = changed | self.markers_under(xs, ys, restored + self.previous_overlays)
+        else:
+            visible = self.markers_under(xs, ys, self.previous_overlays)
+
+        self.marker_version = fleet.version
+        self.marker_state = (xs.copy(), ys.copy(), flags.copy())
+
+        left = (xs[visible] + (self.rect.x - MARKER_RADIUS)).tolist()
+        top = (ys[visible] + (self.rect.y - MARKER_RADIUS)).tolist()
+        sprites = map(self.sprites.__getitem__, marker_states(flags[visible]).tolist())
+        self.screen.set_clip(self.rect)
+        self.screen.blits(zip(sprites, zip(left, top)), doreturn=False)
+        self.screen.set_clip(None)
+
+    def draw_cursor(self, map_x, map_y):
+        ox, oy = self.rect.topleft
+        self.screen.set_clip(self.rect)
+        rect = pygame.draw.circle(self.screen, CURSOR_COLOR, (ox + map_x, oy + map_y), CURSOR_RADIUS)
+        self.screen.set_clip(None)
+        self.add_overlay(rect)
+
+    def draw_status(self, text):
+        """Badge in the bottom-left corner of the map, e.g. when ship data is stale."""
+        surface = self.status_surfaces.get(text)
+        if surface is None:
+            label = self.status_font.render(text, True, STATUS_COLOR)
+            surface = pygame.Surface((label.get_width() + 16, label.get_height() + 8))
+            surface.fill(STATUS_BACKGROUND)
+            surface.blit(label, (8, 4))
+            self.status_surfaces = {text: surface}
+        rect = surface.get_rect(bottomleft=(self.rect.left + 10, self.rect.bottom - 10))
+        self.screen.blit(surface, rect)
+        self.add_overlay(rect)
+
+    def blit_overlay(self, surface, pos):
+        """Blit a prepared surface, such as the ship card, as an overlay."""
+        self.add_overlay(self.screen.blit(surface, pos))
+
+    def add_overlay(self, rect):
+        """Register a region drawn directly on the screen this frame."""
+        self.overlays.append(pygame.Rect(rect))
+
+    def end_frame(self):
+        if self.full_refresh:
+            pygame.display.flip()
+            self.full_refresh = False
+            self.last_full_refresh = self.frame_start
+        else:
+            pygame.display.update(self.dirty + self.previous_overlays + self.overlays)
+        self.previous_overlays = self.overlays
+        self.track_frame_time(time.perf_counter() - self.frame_start)
+
+    # ------- Dirty Regions -------
+    def marker_rect(self, x, y):
+        ox, oy = self.rect.topleft
+        size = 2 * MARKER_RADIUS + 2
+        return pygame.Rect(ox + x - MARKER_RADIUS - 1, oy + y - MARKER_RADIUS - 1, size, size)
+
+    def markers_under(self, xs, ys, rects):
+        """Mask of the markers that overlap any of the given screen rects."""
+        mask = np.zeros(len(xs), dtype=bool)
+        if not rects:
+            return mask
+        sx = xs + self.rect.x
+        sy = ys + self.rect.y
+        reach = MARKER_RADIUS + 1
+        for rect in rects:
+            mask |= ((sx + reach >= rect.left) & (sx - reach < rect.right) &
+                     (sy + reach >= rect.top) & (sy - reach < rect.bottom))
+        return mask
+
+    def restore_markers(self, xs, ys):
+        """
+        Paint the base map back over markers drawn at (xs, ys) and mark those rects dirty.
+
+        Both go together: a rect restored only on the back buffer leaves a
+        ghost marker on screen until the next full refresh.
+        """
+        rects = [self.marker_rect(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+        for rect in rects:
+            self.restore(rect)
+        self.dirty.extend(rects)
+        return rects
+
+    def restore(self, rect):
+        """Paint the cached base map (or background) back over a screen region."""
+        self.screen.fill(BACKGROUND_COLOR, rect)
+        visible = rect.clip(self.rect)
+        if visible.width and visible.height:
+            self.screen.blit(self.base, visible.topleft, visible.move(-self.rect.x, -self.rect.y))
+
+    # ------- Frame Time -------
+    def track_frame_time(self, seconds):
+        # Smoothed for the ship refresh log; percentiles are the FrameProfiler's job (F3)
+        self.average_frame_time += 0.05 * (seconds - self.average_frame_time)
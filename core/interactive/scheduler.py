@@ -0,0 +1,112 @@
+import time
+import cv2
+
+IDLE_INTERVAL = 0.5        # seconds between inferences while nobody is at the maquette
+IDLE_AFTER = 3.0           # seconds without motion or hands before dropping to idle
+MOTION_THRESHOLD = 4.0     # mean absolute difference (0-255) of the downscaled ROI
+MOTION_SIZE = (64, 48)
+REPORT_INTERVAL = 60.0     # seconds
+
+IDLE = "idle"
+ACTIVE = "active"
+
+
+class InferenceScheduler:
+    """
+    Decides which camera frames are sent to the hand tracker.
+
+    A cheap frame difference over a tiny grayscale copy of the ROI detects
+    motion. While idle only one frame every IDLE_INTERVAL seconds is
+    inferred; motion, a visible hand or a running selection dwell switch to
+    every active_every-th frame (the tips are carried by optical flow in
+    between) until IDLE_AFTER seconds pass without any of them.
+
+    The worker's CPU time reported in each HandResult is attributed to the
+    current state, and the time from motion onset to the first detected
+    hand is recorded as wake-up latency.
+    """
+
+    def __init__(self, roi=None, active_every=1):
+        self.roi = roi
+        self.active_every = max(1, active_every)
+        self.active_frames = 0
+        self.state = IDLE
+        self.prev_small = None
+        self.last_activity = float("-inf")
+        self.last_inference = float("-inf")
+
+        self.wake_started = None
+        self.wake_latencies = []
+        self.state_since = time.time()
+        self.wall_time = {IDLE: 0.0, ACTIVE: 0.0}
+        self.cpu_time = {IDLE: 0.0, ACTIVE: 0.0}
+        self.inferences = {IDLE: 0, ACTIVE: 0}
+        self.last_cpu = None
+        self.last_report = self.state_since
+
+    def motion(self, frame):
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            frame = frame[y0:y1, x0:x1]
+        small = cv2.cvtColor(cv2.resize(frame, MOTION_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        prev, self.prev_small = self.prev_small, small
+        if prev is None:
+            return 0.0
+        return float(cv2.absdiff(small, prev).mean())
+
+    def should_infer(self, frame, now, hand_present=False, dwell_active=False):
+        moving = self.motion(frame) > MOTION_THRESHOLD
+        if moving or hand_present or dwell_active:
+            self.last_activity = now
+
+        if now - self.last_activity < IDLE_AFTER:
+            if self.state == IDLE:
+                self.switch(ACTIVE, now)
+                self.active_frames = 0
+                if moving and not hand_present:
+                    self.wake_started = now
+        elif self.state == ACTIVE:
+            self.switch(IDLE, now)
+            self.wake_started = None
+
+        if self.state == ACTIVE:
+            self.active_frames += 1
+            return (self.active_frames - 1) % self.active_every == 0
+        return now - self.last_inference >= IDLE_INTERVAL
+
+    def switch(self, state, now):
+        self.wall_time[self.state] += now - self.state_since
+        self.state = state
+        self.state_since = now
+
+    def record_inference(self, now):
+        self.last_inference = now
+        self.inferences[self.state] += 1
+
+    def record_result(self, result, now=None):
+        now = time.time() if now is None else now
+        if self.last_cpu is not None:
+            self.cpu_time[self.state] += result.cpu_time - self.last_cpu
+        self.last_cpu = result.cpu_time
+
+        if self.wake_started is not None and len(result.hands):
+            self.wake_latencies.append(now - self.wake_started)
+            self.wake_started = None
+
+        if now - self.last_report >= REPORT_INTERVAL:
+            self.report(now)
+
+    # ------- Report -------
+    def report(self, now):
+        self.switch(self.state, now)
+        parts = []
+        for state in (IDLE, ACTIVE):
+            wall = self.wall_time[state]
+            if wall > 0:
+                parts.append(f"{state} {self.cpu_time[state] / wall:.0%} CPU, "
+                             f"{self.inferences[state] / wall:.1f} inf/s over {wall:.0f}s")
+        if self.wake_latencies:
+            avg = sum(self.wake_latencies) / len(self.wake_latencies)
+            parts.append(f"wake-up avg {avg * 1000:.0f} ms ({len(self.wake_latencies)}x)")
+        print("Hand scheduler: " + " | ".join(parts))
+        self.last_report = now
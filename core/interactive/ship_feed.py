@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from core.database.db_setup import load_credentials, migrate_ship_table
+
+TABLE_NAME = "ships"
+REFRESH_INTERVAL = 60.0   # seconds between successful refreshes
+RETRY_INTERVAL = 5.0      # seconds between attempts while the database is down
+LOOKBACK = timedelta(minutes=10)
+STALE_AFTER = 2.5 * REFRESH_INTERVAL
+
+SHIP_QUERY = f"""
+    SELECT s.mmsi, s.latitude, s.longitude, s.speed, s.course, s.timestamp,
+           COALESCE(s.thumbnail_path, s.image_path), s.name, s.destination, s.eta, s.navigation_status
+    FROM {TABLE_NAME} s
+    INNER JOIN (
+        SELECT mmsi, MAX(timestamp) AS latest_timestamp
+        FROM {TABLE_NAME}
+        WHERE timestamp BETWEEN %s AND %s
+        GROUP BY mmsi
+    ) latest ON s.mmsi = latest.mmsi AND s.timestamp = latest.latest_timestamp
+    ORDER BY s.timestamp DESC;
+"""
+
+ShipSnapshot = namedtuple("ShipSnapshot", "mmsi lat lon speed course fix_time info fetched_at duration")
+
+
+# ------- Database Connection -------
+def connect_database():
+    credentials = load_credentials()
+    engine = credentials.pop("engine")
+
+    if engine == "postgresql":
+        import psycopg2
+        conn = psycopg2.connect(**credentials)
+    elif engine == "mysql":
+        import mysql.connector
+        conn = mysql.connector.connect(**credentials)
+    else:
+        raise ValueError(f"Unsupported database engine: {engine}")
+
+    # The display can run on cached data without the AIS receiver, so a database
+    # from an older version gets the columns SHIP_QUERY reads here as well
+    cur = conn.cursor()
+    try:
+        migrate_ship_table(conn, cur)
+    finally:
+        cur.close()
+    return conn
+
+
+def build_snapshot(rows, fetched_at, duration):
+    return ShipSnapshot(
+        mmsi=[row[0] for row in rows],
+        lat=[float(row[1]) for row in rows],
+        lon=[float(row[2]) for row in rows],
+        speed=[float(row[3]) if row[3] is not None else 0.0 for row in rows],
+        course=[float(row[4]) if row[4] is not None else float("nan") for row in rows],
+        fix_time=[row[5].timestamp() if row[5] is not None else fetched_at for row in rows],
+        info=[row[6:] for row in rows],
+        fetched_at=fetched_at,
+        duration=duration,
+    )
+
+
+class ShipFeed(threading.Thread):
+    """
+    Polls the ships table on a background thread.
+
+    Each refresh builds a complete ShipSnapshot and swaps it into a single
+    slot; the render loop picks it up with take() and never waits on the
+    database. When the database is unreachable the feed keeps retrying and
+    reports itself as stale.
+    """
+
+    def __init__(self, connect=connect_database, interval=REFRESH_INTERVAL):
+        super().__init__(name="ShipFeed", daemon=True)
+        self.connect = connect
+        self.interval = interval
+        self.conn = None
+
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+
+        self.last_success = None
+        self.last_error = None
+        self.last_duration = None
+
+    def run(self):
+        while not self._stopped.is_set():
+            ok = self.refresh()
+            self._wake.wait(self.interval if ok else RETRY_INTERVAL)
+            self._wake.clear()
+        self.close()
+
+    def refresh(self):
+        start = time.perf_counter()
+        end_time = datetime.now()
+        try:
+            if self.conn is None:
+                self.conn = self.connect()
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(SHIP_QUERY, (end_time - LOOKBACK, end_time))
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            # Ends the read transaction so the next poll sees new inserts
+            self.conn.commit()
+        except Exception as e:
+            if self.last_error is None:
+                print(f"Ship feed: database unavailable ({e}), retrying every {RETRY_INTERVAL:.0f}s")
+            self.last_error = str(e)
+            self.close()
+            return False
+
+        duration = time.perf_counter() - start
+        snapshot = build_snapshot(rows, time.time(), duration)
+        with self._lock:
+            self._snapshot = snapshot
+        self.last_success = snapshot.fetched_at
+        self.last_duration = duration
+        if self.last_error is not None:
+            print("Ship feed: database connection restored")
+        self.last_error = None
+        return True
+
+    def take(self):
+        """Return the newest snapshot not yet taken, or None."""
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+        return snapshot
+
+    def is_stale(self, now=None):
+        now = time.time() if now is None else now
+        if self.last_error is not None:
+            return True
+        return self.last_success is not None and now - self.last_success > STALE_AFTER
+
+    def status_text(self):
+        if self.last_success is None:
+            return "Ship data offline - no update yet"
+        last = datetime.fromtimestamp(self.last_success).strftime("%H:%M")
+        return f"Ship data offline - last update {last}"
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def stop(self, timeout=2.0):
+        self._stopped.set()
+        self._wake.set()
+        self.join(timeout)
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
@@ -0,0 +1,63 @@
+import numpy as np
+
+KEY_STRIDE = 1 << 32
+KEY_OFFSET = 1 << 31
+
+
+class GridIndex:
+    """
+    Uniform grid over ship pixel positions.
+
+    build() sorts the points by cell once; nearest() then only looks at the
+    cells within radius of the query, so hit-testing the cursor costs about
+    the same for ten ships as for fifty thousand.
+    """
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = np.zeros(0, dtype=np.intp)
+        self.xs = np.zeros(0, dtype=np.int64)
+        self.ys = np.zeros(0, dtype=np.int64)
+
+    def cell_keys(self, cx, cy):
+        return cx * KEY_STRIDE + (cy + KEY_OFFSET)
+
+    def build(self, xs, ys):
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        keys = self.cell_keys(self.xs // self.cell_size, self.ys // self.cell_size)
+        self.order = np.argsort(keys, kind="stable")
+        unique, starts, counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+        self.cells = dict(zip(unique.tolist(), zip(starts.tolist(), (starts + counts).tolist())))
+
+    def candidates(self, x, y, radius):
+        reach = -(-radius // self.cell_size)
+        cx, cy = int(x) // self.cell_size, int(y) // self.cell_size
+        slices = []
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                span = self.cells.get(self.cell_keys(i, j))
+                if span is not None:
+                    slices.append(self.order[span[0]:span[1]])
+        if not slices:
+            return self.order[:0]
+        return np.concatenate(slices) if len(slices) > 1 else slices[0]
+
+    def nearest(self, x, y, radius):
+        """Index of the point closest to (x, y) within radius, or None."""
+        rows = self.candidates(x, y, radius)
+        if len(rows) == 0:
+            return None
+        dx = self.xs[rows] - x
+        dy = self.ys[rows] - y
+        dist_sq = dx * dx + dy * dy
+        best = int(np.argmin(dist_sq))
+        return int(rows[best]) if dist_sq[best] <= radius * radius else None
+
+    def within(self, x, y, radius):
+        """Indices of all points within radius of (x, y)."""
+        rows = self.candidates(x, y, radius)
+        dx = self.xs[rows] - x
+        dy = self.ys[rows] - y
+        return rows[dx * dx + dy * dy <= radius * radius]